@@ -0,0 +1,169 @@
+import asyncio
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from fingerprints import StreamingDeduper
+from kyobo_api import KYOBO_HOST, KyoboReviewAPI, build_session
+from records import ReviewBatch
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, at most `burst` saved up."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.capacity = float(max(1, burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        # The lock keeps waiters in FIFO order so the budget is spent evenly
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostRateLimiter:
+    """One shared TokenBucket per host, so every book fetched from Kyobo draws from the same budget."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.buckets = {}
+
+    async def acquire(self, url):
+        host = urlparse(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate, self.burst)
+        await self.buckets[host].acquire()
+
+
+class AsyncPageClient:
+    """Plumbing shared by the async clients (AsyncReviewFetcher, audit.LedgerAuditor): one per-host rate
+    limiter, one pooled session, a thread pool for the blocking requests calls and a worker queue."""
+
+    thread_name_prefix = "kyobo-async"
+
+    def __init__(self, base_url=KYOBO_HOST, rate=5.0, burst=1, concurrency=8, page_limit=100, session=None):
+        self.base_url = base_url.rstrip("/")
+        self.limiter = HostRateLimiter(rate, burst)
+        self.concurrency = concurrency
+        self.page_limit = page_limit
+        self.session = session if session is not None else build_session(pool_size=concurrency)
+        self.stats = {}
+        self._executor = None
+
+    def new_api(self):
+        return KyoboReviewAPI(base_url=self.base_url, session=self.session, page_limit=self.page_limit)
+
+    async def fetch_page(self, api, book_id, page):
+        """api.fetch_page once the host's token bucket allows it, run in the pool (the loop never blocks)."""
+        await self.limiter.acquire(self.base_url)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, api.fetch_page, book_id, page)
+
+    async def drain(self, queue, handle, describe=str):
+        """Run `concurrency` workers calling `await handle(item)` until the queue is empty (handle may queue
+        more). An exception costs that item only (stats['errors']): a worker that died would leave its
+        item unfinished and queue.join() waiting forever."""
+        async def worker():
+            while True:
+                item = await queue.get()
+                try:
+                    await handle(item)
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    print(f"   !! [Async] {describe(item)}: {e}")
+                finally:
+                    queue.task_done()
+
+        # Own executor sized to `concurrency` (the default one is capped by CPU count)
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix=self.thread_name_prefix)
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self._executor.shutdown(wait=False)
+
+
+class AsyncReviewFetcher(AsyncPageClient):
+    """[Async Collector] Fetch many pages of many books concurrently, capped at `rate` requests/sec per host.
+
+    Page 1 of every book is queued first; its totalCount tells us how many more pages to queue.
+    Blocking requests calls run in a thread pool, so no extra HTTP dependency is needed.
+    """
+
+    thread_name_prefix = "kyobo-fetch"
+
+    async def fetch_books(self, book_ids, max_pages=50):
+        """Return {book_id: DataFrame(REVIEW_COLUMNS)} for every requested book."""
+        queue = asyncio.Queue()
+        pages = {book_id: {} for book_id in book_ids}
+        apis = {book_id: self.new_api() for book_id in book_ids}
+        stats = self.stats = {'requests': 0, 'errors': 0, 'max_queue_depth': 0, 'queue_depth_samples': []}
+
+        def enqueue(book_id, page):
+            queue.put_nowait((book_id, page))
+            stats['max_queue_depth'] = max(stats['max_queue_depth'], queue.qsize())
+
+        async def handle(item):
+            book_id, page = item
+            stats['queue_depth_samples'].append(queue.qsize())
+            stats['requests'] += 1
+            api = apis[book_id]
+            data = await self.fetch_page(api, book_id, page)
+            reviews = data.get('reviewList') or []
+            pages[book_id][page] = [api.parse_review(review, page) for review in reviews]
+
+            if page == 1 and api.total_count is not None:
+                last_page = min(max_pages, math.ceil(api.total_count / self.page_limit))
+                for next_page in range(2, last_page + 1):
+                    enqueue(book_id, next_page)
+            elif api.total_count is None and len(reviews) == self.page_limit and page < max_pages:
+                # No ledger in the envelope: discover pages one at a time
+                enqueue(book_id, page + 1)
+
+        for book_id in book_ids:
+            enqueue(book_id, 1)
+
+        started = time.perf_counter()
+        await self.drain(queue, handle, describe=lambda item: f"{item[0]} page {item[1]}")
+        elapsed = time.perf_counter() - started
+
+        samples = stats.pop('queue_depth_samples')
+        stats.update(
+            seconds=round(elapsed, 3),
+            achieved_rps=round(stats['requests'] / elapsed, 2) if elapsed else 0.0,
+            target_rps=self.limiter.rate,
+            avg_queue_depth=round(sum(samples) / len(samples), 2) if samples else 0.0,
+        )
+        print(f"   >> [Async] {stats['requests']} requests in {stats['seconds']}s "
+              f"({stats['achieved_rps']} req/s, target {stats['target_rps']}), max queue depth {stats['max_queue_depth']}")
+
+        # pandas is only imported by to_frame() -- the audit path, which reuses the limiter, never gets here
+        frames = {}
+        for book_id, book_pages in pages.items():
+            # Pages arrive out of order; de-duplicate in page order (a review that shifted pages is kept once)
+            dedup, batch = StreamingDeduper(), ReviewBatch()
+            for page in sorted(book_pages):
+                batch.extend(dedup.check(book_pages[page])[0])
+            frames[book_id] = batch.to_frame()
+        return frames
+
+    def run(self, book_ids, max_pages=50):
+        """Synchronous entry point for scripts that are not already inside an event loop."""
+        return asyncio.run(self.fetch_books(list(book_ids), max_pages))
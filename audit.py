@@ -0,0 +1,151 @@
+import asyncio
+import csv
+import math
+import os
+import time
+
+from async_fetcher import AsyncPageClient
+from kyobo_api import KYOBO_HOST
+
+AUDIT_COLUMNS = ['book_id', 'claimed', 'physical', 'missing', 'last_page', 'requests', 'status', 'error']
+
+
+class LedgerAuditor(AsyncPageClient):
+    """[Forensic Audit] Ledger (claimed) vs physical review count per book, without extracting any content.
+
+    claimed  = totalCount from the API envelope of page 1
+    physical = (last_page - 1) * page_limit + len(last page)
+
+    Usually 1 request (books that fit on one page) or 2 (page 1 + the page the ledger says is last).
+    When reviews were deleted so that page is empty, the real last page is found by binary search.
+    Books are audited concurrently, sharing one per-host token bucket (see async_fetcher).
+    """
+
+    thread_name_prefix = "kyobo-audit"
+
+    async def audit_book(self, book_id):
+        row = dict.fromkeys(AUDIT_COLUMNS, "")
+        row.update(book_id=book_id, requests=0, status='ok')
+        api = self.new_api()
+        limit = self.page_limit
+
+        async def count(page):
+            """Number of reviews on one page (the list is only measured, never parsed)."""
+            # Counted here, not from self.stats: other books' requests run concurrently
+            row['requests'] += 1
+            data = await self.fetch_page(api, book_id, page)
+            return len(data.get('reviewList') or [])
+
+        try:
+            first = await count(1)
+            claimed = api.total_count or 0
+            last, size = 1, first
+
+            if first == limit:
+                # Jump straight to the page the ledger says is last
+                guess = max(2, math.ceil(claimed / limit))
+                size = await count(guess)
+                if size:
+                    last = guess
+                    # More reviews than the ledger claims: walk forward until a short page
+                    while size == limit:
+                        last += 1
+                        size = await count(last)
+                    if size == 0:
+                        last, size = last - 1, limit
+                else:
+                    # Ledger overstates: last non-empty page lies in [1, guess) -> binary search
+                    full, empty = 1, guess
+                    while empty - full > 1:
+                        mid = (full + empty) // 2
+                        n = await count(mid)
+                        if n == 0:
+                            empty = mid
+                        elif n == limit:
+                            full = mid
+                        else:
+                            full, empty, size = mid, mid, n
+                            break
+                    last = full
+                    if empty != full:
+                        size = limit
+
+            physical = (last - 1) * limit + size
+            row.update(claimed=claimed, physical=physical, missing=claimed - physical, last_page=last)
+        except Exception as e:
+            row.update(status='error', error=str(e)[:200])
+            self.stats['errors'] += 1
+        self.stats['requests'] += row['requests']
+        return row
+
+    async def audit_books(self, book_ids):
+        self.stats = {'books': len(book_ids), 'requests': 0, 'errors': 0}
+        queue = asyncio.Queue()
+        for book_id in book_ids:
+            queue.put_nowait(book_id)
+        rows = {}
+
+        async def handle(book_id):
+            rows[book_id] = await self.audit_book(book_id)
+
+        started = time.perf_counter()
+        await self.drain(queue, handle)
+        elapsed = time.perf_counter() - started
+        self.stats.update(seconds=round(elapsed, 3),
+                          books_per_sec=round(len(book_ids) / elapsed, 2) if elapsed else 0.0,
+                          requests_per_book=round(self.stats['requests'] / len(book_ids), 2) if book_ids else 0.0)
+        return [rows[book_id] for book_id in book_ids]
+
+    def run(self, book_ids):
+        """Synchronous entry point: one discrepancy-table row per book, in input order."""
+        return asyncio.run(self.audit_books(list(dict.fromkeys(book_ids))))
+
+
+def write_audit_table(rows, filename):
+    """Discrepancy table as .csv (utf-8-sig) or .xlsx, largest discrepancies first."""
+    rows = sorted(rows, key=lambda r: (r['status'] != 'ok', -(r['missing'] or 0) if r['status'] == 'ok' else 0))
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in (".xlsx", ".xlsm"):
+        from report_writer import write_report
+        write_report(rows, filename, columns=AUDIT_COLUMNS, keywords=None)
+    elif ext == ".csv":
+        with open(filename, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.DictWriter(f, fieldnames=AUDIT_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        raise ValueError(f"Unsupported audit format '{ext}' (use .csv or .xlsx)")
+    return rows
+
+
+def print_audit_summary(rows, stats, top=20):
+    ok = [r for r in rows if r['status'] == 'ok']
+    flagged = sorted((r for r in ok if r['missing']), key=lambda r: -abs(r['missing']))
+    print("\n" + "=" * 40)
+    print(f"   [Audit Report] {len(rows)} books, {stats.get('requests', 0)} requests in {stats.get('seconds', 0)}s "
+          f"({stats.get('requests_per_book', 0)} per book)")
+    print(f"   ✅ Exact match      : {len(ok) - len(flagged)}")
+    print(f"   ⚠️ Discrepancies    : {len(flagged)} ({sum(r['missing'] for r in flagged)} reviews net)")
+    print(f"   ❌ Errors           : {len(rows) - len(ok)}")
+    print("=" * 40)
+    for r in flagged[:top]:
+        print(f"   {r['book_id']:<16} claimed {r['claimed']:>6} / physical {r['physical']:>6}  ({r['missing']:+d})")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from cli import read_id_file
+
+    parser = argparse.ArgumentParser(description="Ledger vs physical review counts for many books.")
+    parser.add_argument("book_ids", help="Text file with one book ID per line")
+    parser.add_argument("-o", "--output", default="audit_report.csv")
+    parser.add_argument("--rate", type=float, default=5.0, help="Requests per second per host")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--base-url", default=KYOBO_HOST)
+    args = parser.parse_args()
+
+    auditor = LedgerAuditor(args.base_url, rate=args.rate, concurrency=args.concurrency)
+    rows = auditor.run(read_id_file(args.book_ids))
+    write_audit_table(rows, args.output)
+    print_audit_summary(rows, auditor.stats)
@@ -0,0 +1,160 @@
+import os
+import queue
+import threading
+import time
+
+import pandas as pd
+
+from browser_pool import BrowserPool
+from lean_browser import enable_blocking, lean_chrome_options
+from main import PalantirIntegrator
+from near_duplicates import NearDuplicateIndex
+
+
+def read_book_ids(source):
+    """Accept a path to a text file (one ID per line, '#' comments allowed) or any iterable of IDs."""
+    if isinstance(source, (str, os.PathLike)) and os.path.isfile(source):
+        with open(source, encoding="utf-8") as f:
+            lines = [line.split("#", 1)[0].strip() for line in f]
+        return [line for line in lines if line]
+    return [str(book_id).strip() for book_id in source if str(book_id).strip()]
+
+
+class BatchWorker(threading.Thread):
+    """[Batch Worker] Owns one PalantirIntegrator (and its Chrome) and reuses it for every ID it pulls.
+
+    Threads are enough here: the heavy lifting happens in the chromedriver / Chrome processes,
+    so each worker spends its time waiting on I/O rather than holding the GIL.
+    """
+
+    def __init__(self, worker_id, jobs, results, output_dir, engine, max_pages, integrator_factory, delta=False,
+                 resume=False):
+        super().__init__(name=f"worker-{worker_id}", daemon=True)
+        self.worker_id = worker_id
+        self.jobs = jobs
+        self.results = results
+        self.output_dir = output_dir
+        self.engine = engine
+        self.max_pages = max_pages
+        self.integrator_factory = integrator_factory
+        self.delta = delta
+        self.resume = resume
+        self.stats = {'worker': worker_id, 'books': 0, 'failed': 0, 'reviews': 0, 'busy_seconds': 0.0}
+
+    def run(self):
+        bot = self.integrator_factory()
+        started = time.perf_counter()
+        try:
+            while True:
+                try:
+                    book_id = self.jobs.get_nowait()
+                except queue.Empty:
+                    break
+                output_file = os.path.join(self.output_dir, f"{book_id}.xlsx")
+                # With a browser pool the browser goes back to the pool after every book (so it can be recycled)
+                result = bot.execute_pipeline(book_id, output_file, engine=self.engine, max_pages=self.max_pages,
+                                              keep_browser=bot.browser_pool is None, delta=self.delta,
+                                              resume=self.resume)
+                result['worker'] = self.worker_id
+                self.results.append(result)
+
+                self.stats['books'] += 1
+                self.stats['failed'] += result['status'] != 'ok'
+                self.stats['reviews'] += result['collected']
+                self.stats['busy_seconds'] += result['seconds']
+        finally:
+            bot.close()
+            self.stats['wall_seconds'] = round(time.perf_counter() - started, 2)
+
+
+def run_batch(book_ids, output_dir="batch_output", workers=2, engine="selenium", max_pages=50,
+              integrator_factory=None, delta=False, browser_pool=None, lean=False, checkpoint_dir=None, resume=False,
+              near_dups=None):
+    """[Batch Mode] Spread book IDs over N reusable workers.
+
+    Writes one report per book, plus batch_summary.xlsx (one row per book)
+    and batch_workers.xlsx (throughput per worker). Returns (summary_df, worker_df).
+    browser_pool: optional BrowserPool shared by the workers (warm browsers, recycled every N books).
+    lean: headless browsers that skip images, fonts, media and analytics/ad requests.
+    checkpoint_dir / resume: per-page checkpoints; resume=True re-runs the list and continues every
+    interrupted book after its last saved page (finished books have no checkpoint left and start over).
+    near_dups: optional NearDuplicateIndex shared by every worker, so copies are found across the whole list.
+    """
+    if integrator_factory is None:
+        integrator_factory = lambda: PalantirIntegrator(browser_pool=browser_pool, lean=lean,
+                                                        checkpoint_dir=checkpoint_dir, near_dups=near_dups)
+    book_ids = read_book_ids(book_ids)
+    os.makedirs(output_dir, exist_ok=True)
+    print(f"--- [Batch] {len(book_ids)} books across {workers} workers (engine={engine}) ---")
+
+    jobs = queue.Queue()
+    for book_id in book_ids:
+        jobs.put(book_id)
+    results = []  # list.append is atomic under the GIL
+
+    started = time.perf_counter()
+    pool = [BatchWorker(i + 1, jobs, results, output_dir, engine, max_pages, integrator_factory, delta, resume)
+            for i in range(max(1, min(workers, len(book_ids))))]
+    for worker in pool:
+        worker.start()
+    for worker in pool:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    summary = pd.DataFrame(results, columns=['book_id', 'worker', 'engine', 'status', 'claimed', 'collected',
+                                             'seconds', 'output_file', 'error'])
+    if not summary.empty:
+        summary['missing'] = summary['claimed'] - summary['collected']
+
+    worker_stats = pd.DataFrame([w.stats for w in pool])
+    if not worker_stats.empty:
+        worker_stats['busy_seconds'] = worker_stats['busy_seconds'].round(2)
+        worker_stats['books_per_min'] = (worker_stats['books'] / worker_stats['wall_seconds'].clip(lower=1e-9) * 60).round(2)
+        worker_stats['reviews_per_sec'] = (worker_stats['reviews'] / worker_stats['wall_seconds'].clip(lower=1e-9)).round(1)
+
+    summary.to_excel(os.path.join(output_dir, "batch_summary.xlsx"), index=False)
+    worker_stats.to_excel(os.path.join(output_dir, "batch_workers.xlsx"), index=False)
+
+    print("\n" + "=" * 40)
+    print(f"   [Batch Report] {len(summary)} books in {elapsed:.1f}s")
+    if not summary.empty:
+        print(f"   Succeeded: {(summary['status'] == 'ok').sum()} / Failed: {(summary['status'] != 'ok').sum()}")
+        print(f"   Reviews collected: {summary['collected'].sum()}")
+    print("=" * 40 + "\n")
+    return summary, worker_stats
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the integrator over many book IDs.")
+    parser.add_argument("book_ids", help="Text file with one book ID per line")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--engine", choices=PalantirIntegrator.ENGINES, default="selenium")
+    parser.add_argument("--max-pages", type=int, default=50)
+    parser.add_argument("--output-dir", default="batch_output")
+    parser.add_argument("--delta", action="store_true", help="Only collect reviews newer than the saved watermark")
+    parser.add_argument("--pool", action="store_true", help="Share a pool of warm headless browsers")
+    parser.add_argument("--recycle-after", type=int, default=25, help="Books per pooled browser before it is replaced")
+    parser.add_argument("--max-browser-mb", type=int, default=1500, help="Replace a pooled browser above this memory")
+    parser.add_argument("--lean", action="store_true", help="Headless, no images/fonts/media/analytics requests")
+    parser.add_argument("--checkpoint-dir", help="Per-page progress of every book (off unless set; --resume reads it)")
+    parser.add_argument("--resume", action="store_true", help="Continue interrupted books from their last saved page")
+    parser.add_argument("--near-dups", metavar="PATH", help="Near-duplicate index file (.npz), shared by the workers")
+    args = parser.parse_args()
+
+    near_dups = NearDuplicateIndex.load(args.near_dups) if args.near_dups else None
+    pool = None
+    if args.pool and args.engine != "api":
+        lean_hooks = {'options_factory': lean_chrome_options, 'on_launch': enable_blocking} if args.lean else {}
+        pool = BrowserPool(size=args.workers, max_books=args.recycle_after, max_memory_mb=args.max_browser_mb,
+                           **lean_hooks)
+    try:
+        run_batch(args.book_ids, args.output_dir, args.workers, args.engine, args.max_pages, delta=args.delta,
+                  browser_pool=pool, lean=args.lean, checkpoint_dir=args.checkpoint_dir, resume=args.resume,
+                  near_dups=near_dups)
+    finally:
+        if pool is not None:
+            pool.close()
+        if near_dups is not None:
+            near_dups.save(args.near_dups)
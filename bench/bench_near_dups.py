@@ -0,0 +1,87 @@
+"""[Bench] near_duplicates.NearDuplicateIndex on a synthetic Korean corpus (throughput, scaling, recall).
+
+    python bench/bench_near_dups.py                           # 100k, 200k, 400k reviews
+    python bench/bench_near_dups.py --sizes 1000000 --output bench/near_dups.json
+
+Every book gets 1,000 random-syllable reviews; every --template-every'th book also gets one copy of a
+promotional template with a few syllables swapped and a suffix added (the copy-paste pattern).
+Per size: add() throughput, the cost of one more report (add + annotate of a 1,000-review book on top of
+the full corpus -- what finalize_report pays per book, it should not grow with the corpus), and how many
+planted copies ended up in the template's cluster (recall) vs how many random reviews were flagged.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+
+from near_duplicates import NearDuplicateIndex
+
+SYLLABLES = [chr(code) for code in range(0xAC00, 0xAC00 + 2000)]
+TEMPLATE = "이 책 정말 강추합니다 인생책이에요 지금 이벤트 중이니 꼭 구매하세요 후회 안 합니다 최고의 책"
+
+
+def random_review(rng):
+    return "".join(rng.choice(SYLLABLES) + (" " if rng.random() < 0.25 else "") for _ in range(rng.randint(15, 80)))
+
+
+def edited_copy(rng, edits=2):
+    chars = list(TEMPLATE)
+    for _ in range(edits):
+        chars[rng.randrange(len(chars))] = rng.choice(SYLLABLES)
+    return "".join(chars) + rng.choice(["!!", "^^", "~", ""])
+
+
+def run(size, template_every, seed=7):
+    rng = random.Random(seed)
+    books = []
+    for b in range(size // 1000):
+        contents = [random_review(rng) for _ in range(1000)]
+        if b % template_every == 0:
+            contents[0] = edited_copy(rng)
+        books.append((f"B{b:05d}", contents))
+    planted = sum(1 for b in range(len(books)) if b % template_every == 0)
+
+    index = NearDuplicateIndex()
+    started = time.perf_counter()
+    for book_id, contents in books:
+        index.add(book_id, [f"{book_id}-{i}" for i in range(len(contents))], ["2026-10-01"] * len(contents), contents)
+    add_seconds = time.perf_counter() - started
+
+    contents = [random_review(rng) for _ in range(999)] + [edited_copy(rng)]
+    frame = pd.DataFrame({'Writer': [f"extra-{i}" for i in range(1000)], 'Date': "2026-10-01", 'Content': contents})
+    started = time.perf_counter()
+    index.add_frame(frame, "EXTRA")
+    index.annotate(frame, "EXTRA")
+    report_seconds = time.perf_counter() - started
+
+    label, found, _ = index.top_clusters(1)[0]
+    flagged = int(sum(size for _, size, _ in index.top_clusters(len(index))))
+    return {'reviews': len(index), 'add_s': round(add_seconds, 2),
+            'reviews_per_s': round(len(index) / add_seconds), 'report_ms': round(report_seconds * 1000, 1),
+            'planted': planted + 1, 'recall': round(found / (planted + 1), 3), 'false_flags': flagged - found}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 200000, 400000])
+    parser.add_argument("--template-every", type=int, default=3, help="Plant a templated copy in every Nth book")
+    parser.add_argument("--output", help="Write the results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        result = run(size, args.template_every)
+        results.append(result)
+        print(f"🧬 [Bench] {result['reviews']:>9,} reviews: add {result['add_s']:6.1f}s "
+              f"({result['reviews_per_s']:,}/s), one more book {result['report_ms']:6.1f}ms, "
+              f"recall {result['recall']:.1%} of {result['planted']} copies, {result['false_flags']} false flags")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
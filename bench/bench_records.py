@@ -0,0 +1,139 @@
+"""[Bench] Per-review dicts vs records.ReviewBatch on a synthetic corpus (memory + throughput).
+
+    python bench/bench_records.py                       # 100,000 reviews, 100 per page
+    python bench/bench_records.py --size 500000 --output bench/records.json
+
+Both paths parse the same API review objects page by page, exactly like KyoboReviewAPI.scrape_reviews:
+  dicts : list.extend(page dicts, string Rating / Likes) -> pd.DataFrame(list, columns=REVIEW_COLUMNS)
+  batch : ReviewBatch.extend(page dicts)                  -> batch.to_frame()  (page dicts dropped right away)
+Memory is measured with tracemalloc in a separate pass, so the timings are not slowed down by it.
+Writer / Content strings come from the corpus and are shared by both paths, so retained_mb is the
+per-row overhead on top of the review text (dicts, key slots, numeric strings, date slices).
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+
+from kyobo_api import REVIEW_COLUMNS, KyoboReviewAPI
+from records import ReviewBatch
+from run_bench import fixture_book, load_fixtures
+
+try:
+    import columnar
+    HAS_ARROW = columnar.pa is not None
+except ImportError:
+    HAS_ARROW = False
+
+
+def pages_of(book, page_limit):
+    return [book[i:i + page_limit] for i in range(0, len(book), page_limit)]
+
+
+def parse_review_strings(review, page):
+    """KyoboReviewAPI.parse_review before ReviewBatch: Rating / Likes as strings ('10', '0')."""
+    row = KyoboReviewAPI.parse_review(review, page)
+    row['Rating'], row['Likes'] = str(row['Rating']), str(row['Likes'])
+    return row
+
+
+def collect_dicts(pages):
+    all_reviews = []
+    for page, reviews in enumerate(pages, 1):
+        all_reviews.extend(parse_review_strings(r, page) for r in reviews)
+    return all_reviews
+
+
+def collect_batch(pages):
+    batch = ReviewBatch()
+    for page, reviews in enumerate(pages, 1):
+        batch.extend([KyoboReviewAPI.parse_review(r, page) for r in reviews])
+    return batch
+
+
+PATHS = {
+    'dicts': (collect_dicts, lambda rows: pd.DataFrame(rows, columns=REVIEW_COLUMNS),
+              lambda rows: columnar.to_arrow(rows, "BENCH")),
+    'batch': (collect_batch, lambda batch: batch.to_frame(), lambda batch: batch.to_arrow("BENCH")),
+}
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    value = func(*args)
+    return value, time.perf_counter() - started
+
+
+def measure_memory(collect, convert, pages):
+    """(bytes retained after collecting, peak while collecting, peak while converting to a DataFrame)"""
+    gc.collect()
+    tracemalloc.start()
+    collected = collect(pages)
+    retained, collect_peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    frame = convert(collected)
+    convert_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del frame, collected
+    return retained, collect_peak, convert_peak
+
+
+def run(size, page_limit, repeat):
+    reviews, _ = load_fixtures()
+    pages = pages_of(fixture_book(reviews, size), page_limit)
+    results = {}
+    for name, (collect, to_frame, to_table) in PATHS.items():
+        best = {}
+        for _ in range(repeat):
+            collected, collect_s = timed(collect, pages)
+            frame, frame_s = timed(to_frame, collected)
+            table_s = timed(to_table, collected)[1] if HAS_ARROW else None
+            for key, seconds in (('collect_s', collect_s), ('to_frame_s', frame_s), ('to_arrow_s', table_s)):
+                if seconds is not None:
+                    best[key] = min(best.get(key, seconds), seconds)
+        retained, collect_peak, convert_peak = measure_memory(collect, to_frame, pages)
+        results[name] = {
+            **{key: round(value, 4) for key, value in best.items()},
+            'reviews_per_s': round(size / (best['collect_s'] + best['to_frame_s'])),
+            'retained_mb': round(retained / 2 ** 20, 1),
+            'collect_peak_mb': round(collect_peak / 2 ** 20, 1),
+            'to_frame_peak_mb': round(convert_peak / 2 ** 20, 1),
+            'frame_mb': round(frame.memory_usage(deep=True).sum() / 2 ** 20, 1),
+        }
+        del collected, frame
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memory / throughput of per-review dicts vs ReviewBatch.")
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--page-limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3, help="Timing runs per path (best is kept)")
+    parser.add_argument("--output", help="Also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    print(f"--- [Bench] {args.size} synthetic reviews, {args.page_limit} per page ---")
+    results = run(args.size, args.page_limit, args.repeat)
+    keys = ['collect_s', 'to_frame_s', 'to_arrow_s', 'reviews_per_s', 'retained_mb', 'collect_peak_mb',
+            'to_frame_peak_mb', 'frame_mb']
+    print(f"   {'':<17}" + "".join(f"{name:>12}" for name in results))
+    for key in keys:
+        print(f"   {key:<17}" + "".join(f"{str(r.get(key, '-')):>12}" for r in results.values()))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({'size': args.size, 'page_limit': args.page_limit, 'pandas': pd.__version__,
+                       'results': results}, f, indent=2)
+        print(f"\n✨ [Bench] Results written to {args.output}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""[Bench] Offline benchmark: every stage timed against the local replay server, results as JSON.
+
+    python bench/run_bench.py                                  # 50 / 5,000 / 50,000 reviews, API engine
+    python bench/run_bench.py --sizes 50 5000 --latency 0.05 --selenium --output bench/results.json
+
+Books are built by cycling the recorded fixtures in bench/fixtures/ (each copy gets a unique
+writer/content suffix so de-duplication keeps every row). Compare two result files to spot regressions.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+
+from extractors import available_backends, parse_reviews_html
+from kyobo_api import KyoboReviewAPI
+from main import PalantirIntegrator
+from replay_server import ReplayServer
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+DEFAULT_SIZES = [50, 5000, 50000]
+# Recorded single-line markup + the same reviews indented over several lines (whitespace-only text nodes)
+HTML_FIXTURES = ("review_list_page.html", "review_list_page_indented.html")
+
+
+def load_fixtures(fixture_dir=FIXTURE_DIR):
+    """Recorded API review objects and {name: review-list HTML} for every HTML fixture."""
+    with open(os.path.join(fixture_dir, "review_list_api.json"), encoding="utf-8") as f:
+        reviews = json.load(f)['data']['reviewList']
+    pages = {}
+    for name in HTML_FIXTURES:
+        with open(os.path.join(fixture_dir, name), encoding="utf-8") as f:
+            pages[name] = f.read()
+    return reviews, pages
+
+
+def fixture_book(reviews, size):
+    """`size` review objects made by cycling the fixtures, newest first, every one distinct."""
+    book = []
+    for i in range(size):
+        review = dict(reviews[i % len(reviews)])
+        day = 28 - (i // 100) % 28
+        month = 12 - (i // 2800) % 12
+        review['createdDate'] = f"2025-{month:02d}-{day:02d}" + review['createdDate'][10:]
+        review['mmbrId'] = f"{review['mmbrId']}{i}"
+        review['revwCntn'] = f"{review.get('revwCntn') or ''} #{i}".strip()
+        book.append(review)
+    return book
+
+
+@contextlib.contextmanager
+def quiet(enabled=True):
+    """Swallow the per-page progress prints so they do not dominate the timings."""
+    if not enabled:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+class Bench:
+    def __init__(self, server, verbose=False):
+        self.server = server
+        self.verbose = verbose
+        self.results = []
+
+    def timed(self, size, stage, engine, func, **extra):
+        """Run func once, record seconds and how many replay requests it made."""
+        requests_before = self.server.request_count
+        started = time.perf_counter()
+        with quiet(not self.verbose):
+            value = func()
+        seconds = time.perf_counter() - started
+        record = {'size': size, 'stage': stage, 'engine': engine, 'status': 'ok', 'seconds': round(seconds, 4),
+                  'requests': self.server.request_count - requests_before, **extra}
+        self.results.append(record)
+        print(f"   {engine:<9} {stage:<18} size={size:<6} {seconds:8.3f}s  requests={record['requests']}")
+        return value
+
+    def skipped(self, size, stage, engine, reason):
+        self.results.append({'size': size, 'stage': stage, 'engine': engine, 'status': 'skipped',
+                             'seconds': None, 'requests': 0, 'reason': reason})
+        print(f"   {engine:<9} {stage:<18} size={size:<6} skipped ({reason})")
+
+    def run_api(self, book_id, size, max_pages):
+        api = KyoboReviewAPI(base_url=self.server.url)
+        claimed = self.timed(size, "get_claimed_count", "api", lambda: api.get_claimed_count(book_id))
+        return claimed, self.timed(size, "scrape_reviews", "api",
+                                   lambda: api.scrape_reviews(book_id, max_pages=max_pages))
+
+    def integrator(self):
+        with quiet(not self.verbose):
+            return PalantirIntegrator(api_base_url=self.server.url)
+
+    def run_selenium(self, book_id, size, max_pages):
+        bot = self.integrator()
+        try:
+            try:
+                with quiet(not self.verbose):
+                    bot.driver.get(f"{self.server.url}/detail/{book_id}")
+            except Exception as e:
+                for stage in ("get_claimed_count", "scrape_reviews"):
+                    self.skipped(size, stage, "selenium", f"browser unavailable: {str(e).splitlines()[0]}")
+                return
+            self.timed(size, "get_claimed_count", "selenium", bot.get_claimed_count)
+            self.timed(size, "scrape_reviews", "selenium", lambda: bot.scrape_reviews(max_pages))
+        finally:
+            with quiet(not self.verbose):
+                bot.close()
+
+    def run_report(self, df, claimed, size, workdir):
+        bot = self.integrator()
+        filename = os.path.join(workdir, f"report_{size}.xlsx")
+        self.timed(size, "finalize_report", "report", lambda: bot.finalize_report(df, claimed, filename),
+                   rows=len(df))
+        self.timed(size, "highlight_excel", "report", lambda: bot.highlight_excel(filename), rows=len(df))
+
+    def run_parsers(self, pages, repeat):
+        """Time every backend on every fixture and check it returns exactly what BeautifulSoup does --
+        Content feeds review_key, so a backend that differs changes every dedup / store / watermark key."""
+        for name, html in pages.items():
+            expected = parse_reviews_html(html, 1, 'bs4')
+            for backend in available_backends():
+                rows = self.timed(0, "parse_fragment", backend, lambda: [parse_reviews_html(html, 1, backend)
+                                                                         for _ in range(repeat)][-1],
+                                  repeat=repeat, fixture=name)
+                if rows != expected:
+                    self.results[-1]['status'] = 'mismatch'
+                    print(f"   ⚠️ [Bench] {backend} disagrees with bs4 on {name}.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmark of the review pipeline stages.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Synthetic book sizes")
+    parser.add_argument("--latency", type=float, default=0.0, help="Injected latency per request (seconds)")
+    parser.add_argument("--page-size", type=int, default=10, help="Reviews per rendered HTML page")
+    parser.add_argument("--selenium", action="store_true", help="Also time the Selenium engine (needs Chrome)")
+    parser.add_argument("--selenium-max", type=int, default=5000,
+                        help="Largest book the Selenium engine is timed on (10 reviews per click)")
+    parser.add_argument("--parse-repeat", type=int, default=200)
+    parser.add_argument("--fixtures", default=FIXTURE_DIR)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--verbose", action="store_true", help="Keep the pipeline's own progress output")
+    args = parser.parse_args(argv)
+
+    reviews, pages = load_fixtures(args.fixtures)
+    books = {f"BENCH{size:08d}": fixture_book(reviews, size) for size in args.sizes}
+    print(f"--- [Bench] sizes={args.sizes} latency={args.latency}s page_size={args.page_size} ---")
+
+    with ReplayServer(books, latency=args.latency, page_size=args.page_size) as server, \
+            tempfile.TemporaryDirectory() as workdir:
+        bench = Bench(server, args.verbose)
+        bench.run_parsers(pages, args.parse_repeat)
+        for size in args.sizes:
+            book_id = f"BENCH{size:08d}"
+            max_pages = size // 10 + 2  # enough for the 10-per-click Selenium path as well
+            claimed, df = bench.run_api(book_id, size, max_pages)
+            if args.selenium and size <= args.selenium_max:
+                bench.run_selenium(book_id, size, max_pages)
+            elif args.selenium:
+                for stage in ("get_claimed_count", "scrape_reviews"):
+                    bench.skipped(size, stage, "selenium", f"size > --selenium-max ({args.selenium_max})")
+            bench.run_report(df, claimed, size, workdir)
+
+    output = {
+        'meta': {
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'latency': args.latency,
+            'page_size': args.page_size,
+            'sizes': args.sizes,
+            'backends': available_backends(),
+        },
+        'results': bench.results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(output, f, ensure_ascii=False, indent=2)
+    print(f"\n✨ [Bench] {len(bench.results)} measurements written to {args.output}")
+    return output
+
+
+if __name__ == "__main__":
+    main()
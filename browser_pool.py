@@ -0,0 +1,243 @@
+import json
+import os
+import queue
+import threading
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+# Optional: whole Chrome process tree RSS. Without it the pool falls back to the page's JS heap size.
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+DRIVER_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "palantir", "chromedriver.json")
+_resolve_lock = threading.Lock()
+_resolved_path = None
+
+
+def resolve_chromedriver(cache_path=DRIVER_CACHE_PATH, max_age_days=7, refresh=False):
+    """[Driver Cache] Path of a chromedriver binary, resolved at most once per process.
+
+    Order: CHROMEDRIVER_PATH env var -> in-process memo -> on-disk cache (younger than max_age_days)
+    -> ChromeDriverManager().install(). If the install step fails (offline), a stale cache entry
+    whose binary still exists is used instead.
+    """
+    global _resolved_path
+    env_path = os.environ.get("CHROMEDRIVER_PATH")
+    if env_path:
+        return env_path
+
+    with _resolve_lock:
+        if _resolved_path and not refresh and os.path.exists(_resolved_path):
+            return _resolved_path
+
+        cached = None
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                cached = json.load(f)
+            if not os.path.exists(cached.get('driver_path', "")):
+                cached = None
+        except (OSError, ValueError):
+            cached = None
+
+        fresh = cached is not None and time.time() - cached.get('resolved_at', 0) < max_age_days * 86400
+        if fresh and not refresh:
+            _resolved_path = cached['driver_path']
+            return _resolved_path
+
+        try:
+            started = time.perf_counter()
+            path = ChromeDriverManager().install()
+            print(f"   🔧 [Driver] Resolved chromedriver in {time.perf_counter() - started:.1f}s: {path}")
+        except Exception as e:
+            if cached is None:
+                raise
+            print(f"   ⚠️ [Driver] Resolution failed ({e}); using cached {cached['driver_path']}")
+            _resolved_path = cached['driver_path']
+            return _resolved_path
+
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({'driver_path': path, 'resolved_at': time.time()}, f)
+        os.replace(tmp_path, cache_path)
+        _resolved_path = path
+        return path
+
+
+def chrome_options(headless=False):
+    """The integrator's Chrome flags (plus --headless=new for pooled / background browsers)."""
+    options = webdriver.ChromeOptions()
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--window-size=1920,1080")
+    if headless:
+        options.add_argument("--headless=new")
+    return options
+
+
+def launch_chrome(headless=False, options=None):
+    return webdriver.Chrome(service=Service(resolve_chromedriver()),
+                            options=options if options is not None else chrome_options(headless))
+
+
+def browser_memory_mb(driver):
+    """Memory held by one browser: Chrome process-tree RSS with psutil, else the page's JS heap."""
+    try:
+        if psutil is not None:
+            root = psutil.Process(driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        heap = driver.execute_script("return performance.memory ? performance.memory.usedJSHeapSize : 0;")
+        return (heap or 0) / (1024 * 1024)
+    except Exception:
+        return 0.0
+
+
+class BrowserPool:
+    """[Browser Pool] Pre-launched Chrome instances handed out to pipeline runs.
+
+    The driver binary is resolved once (see resolve_chromedriver). A browser goes back to the pool
+    after each run and is recycled (quit + replaced in the background) once it has served
+    `max_books` books or grown past `max_memory_mb`, which keeps Chrome memory creep bounded.
+
+        pool = BrowserPool(size=2)
+        bot = PalantirIntegrator(browser_pool=pool)
+    """
+
+    def __init__(self, size=2, headless=True, max_books=25, max_memory_mb=1500, prewarm=True, options_factory=None,
+                 on_launch=None):
+        self.size = size
+        self.headless = headless
+        self.max_books = max_books
+        self.max_memory_mb = max_memory_mb
+        # Lean pool: options_factory=lean_chrome_options, on_launch=enable_blocking (see lean_browser.py)
+        self.options_factory = options_factory
+        self.on_launch = on_launch
+        self.idle = queue.Queue()
+        self.books = {}  # id(driver) -> books served
+        self.stats = {'launched': 0, 'recycled': 0, 'discarded': 0, 'acquired': 0, 'launch_seconds': 0.0}
+        self._lock = threading.Lock()
+        self._pending = 0  # replacements being launched in the background
+        self._closed = False
+        if prewarm:
+            self.prewarm()
+
+    def _launch(self):
+        started = time.perf_counter()
+        options = self.options_factory() if self.options_factory is not None else chrome_options(self.headless)
+        driver = launch_chrome(options=options)
+        if self.on_launch is not None:
+            self.on_launch(driver)
+        with self._lock:
+            self.books[id(driver)] = 0
+            self.stats['launched'] += 1
+            self.stats['launch_seconds'] += time.perf_counter() - started
+        return driver
+
+    def _replenish(self):
+        """Launch a replacement off the caller's thread so the next acquire finds it warm."""
+        def launch():
+            try:
+                driver = self._launch()
+            except Exception as e:
+                print(f"   ⚠️ [Pool] Could not launch a replacement browser: {e}")
+                return
+            finally:
+                with self._lock:
+                    self._pending -= 1
+            if self._closed:
+                self._quit(driver)
+            else:
+                self.idle.put(driver)
+        with self._lock:
+            self._pending += 1
+        threading.Thread(target=launch, name="browser-pool-launch", daemon=True).start()
+
+    def prewarm(self):
+        """Start `size` browsers in parallel and wait until they are all idle in the pool."""
+        resolve_chromedriver()  # once, before the threads race for it
+        print(f"--- [Pool] Warming {self.size} {'headless ' if self.headless else ''}browsers ---")
+        def launch():
+            try:
+                self.idle.put(self._launch())
+            except Exception as e:
+                print(f"   ⚠️ [Pool] Could not launch a browser: {e}")
+        threads = [threading.Thread(target=launch, daemon=True) for _ in range(self.size)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def acquire(self, timeout=60):
+        """A warm browser (launched on the spot if the pool is empty and below size)."""
+        with self._lock:
+            self.stats['acquired'] += 1
+            can_launch = len(self.books) + self._pending < self.size
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            if can_launch:
+                return self._launch()
+        return self.idle.get(timeout=timeout)
+
+    def release(self, driver, discard=False):
+        """Return a browser after one book. discard=True (e.g. it failed mid-run) always replaces it."""
+        with self._lock:
+            self.books[id(driver)] = self.books.get(id(driver), 0) + 1
+            served = self.books[id(driver)]
+        memory = 0.0 if discard else browser_memory_mb(driver)
+        reason = ("failed run" if discard else
+                  f"{served} books" if served >= self.max_books else
+                  f"{memory:.0f} MB" if self.max_memory_mb and memory > self.max_memory_mb else None)
+
+        if reason is None and not self._closed:
+            self.idle.put(driver)
+            return
+        self._quit(driver)
+        if self._closed:
+            return
+        with self._lock:
+            self.stats['discarded' if discard else 'recycled'] += 1
+        print(f"   ♻️ [Pool] Recycling browser ({reason})")
+        self._replenish()
+
+    def _quit(self, driver):
+        with self._lock:
+            self.books.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._quit(self.idle.get_nowait())
+            except queue.Empty:
+                break
+        print(f"👋 [Pool] Closed ({self.stats['launched']} launched, {self.stats['recycled']} recycled, "
+              f"{self.stats['discarded']} discarded)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Resolve chromedriver once and cache the path for offline runs.")
+    parser.add_argument("--refresh", action="store_true", help="Re-resolve even if the cache is fresh")
+    parser.add_argument("--cache", default=DRIVER_CACHE_PATH)
+    args = parser.parse_args()
+    print(resolve_chromedriver(args.cache, refresh=args.refresh))
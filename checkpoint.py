@@ -0,0 +1,95 @@
+import json
+import os
+import time
+
+
+class ScrapeCheckpoint:
+    """[Checkpoint] Crash-safe progress of one book's scrape, committed after every page.
+
+    <dir>/<book_id>-<sort>.rows.jsonl  every collected row, appended + fsynced first
+    <dir>/<book_id>-<sort>.json        book ID, sort, last page, page fingerprint, row count and byte offset,
+                                       rewritten atomically (tmp + os.replace) -- this is the commit point
+    Rows past the committed offset (a page half-written when the process died) are cut off on resume,
+    so a failure on page 40 costs that one page.
+    """
+
+    def __init__(self, directory, book_id, sort='001', source='api'):
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"{book_id}-{sort}")
+        self.state_path = base + ".json"
+        self.rows_path = base + ".rows.jsonl"
+        # source: 'api' (100 per page) or 'selenium' (10 per click) -- page numbers only carry over within one
+        self.state = {'book_id': book_id, 'sort': sort, 'source': source, 'last_page': 0, 'fingerprint': None,
+                      'rows': 0, 'rows_bytes': 0, 'done': False, 'updated_at': None}
+
+    @property
+    def next_page(self):
+        return self.state['last_page'] + 1
+
+    def load(self):
+        """Restore the last committed state and return the rows collected so far (None: nothing to resume)."""
+        if not os.path.exists(self.state_path):
+            return None
+        with open(self.state_path, encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get('source') != self.state['source']:
+            print(f"   >> [Checkpoint] Saved by the {state.get('source')} engine (different page size). "
+                  f"(Starting over)")
+            return None
+        # A missing or short row file (deleted / copied half-way) means nothing to resume, not a crash
+        try:
+            with open(self.rows_path, "rb") as f:
+                data = f.read(state['rows_bytes'])
+        except FileNotFoundError:
+            print("   >> [Checkpoint] Row file is missing. (Starting over)")
+            return None
+        if len(data) != state['rows_bytes']:
+            print(f"   >> [Checkpoint] Row file is shorter than the state ({len(data)} < {state['rows_bytes']} bytes). "
+                  f"(Starting over)")
+            return None
+        rows = [json.loads(line) for line in data.splitlines()]
+        if len(rows) != state['rows']:
+            print(f"   >> [Checkpoint] Row file does not match the state ({len(rows)} != {state['rows']}). "
+                  f"(Starting over)")
+            return None
+        os.truncate(self.rows_path, state['rows_bytes'])
+        self.state = state
+        return rows
+
+    def reset(self):
+        """Forget any earlier progress for this book / sort (a fresh, non-resumed run)."""
+        self.clear()
+        self.state.update(last_page=0, fingerprint=None, rows=0, rows_bytes=0, done=False, updated_at=None)
+
+    def save_page(self, page, rows, fingerprint):
+        """Append the page's rows, then commit last_page / fingerprint / offset in one atomic rename.
+        fingerprint: page_fingerprint of the page as parsed (StreamingDeduper.last_fingerprint) -- `rows` may be
+        missing reviews dropped as duplicates, and a resume re-reads and fingerprints the whole page."""
+        with open(self.rows_path, "ab") as f:
+            f.write(b"".join(json.dumps(row, ensure_ascii=False, default=int).encode("utf-8") + b"\n"
+                             for row in rows))
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+        self.state.update(last_page=page, fingerprint=fingerprint, rows=self.state['rows'] + len(rows),
+                          rows_bytes=size)
+        self._commit()
+
+    def finish(self):
+        """Every page is in: a resume after this point (e.g. the report step failed) skips scraping entirely."""
+        self.state['done'] = True
+        self._commit()
+
+    def clear(self):
+        for path in (self.state_path, self.rows_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _commit(self):
+        self.state['updated_at'] = time.strftime("%Y-%m-%d %H:%M:%S")
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.state_path)
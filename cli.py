@@ -0,0 +1,230 @@
+"""[CLI] Single entry point: scrape / audit / report / batch.
+
+Only the standard library is imported at module load; every subcommand imports its own heavy
+dependencies (pandas, selenium, openpyxl, ...) when it runs, so `--help` and report-only runs start fast.
+
+    python cli.py scrape S000217251615 --engine api -o report.xlsx
+    python cli.py audit S000217251615 S000001234567
+    python cli.py report --store reviews.db -o all_reviews.xlsx
+    python cli.py batch book_ids.txt --workers 4 --pool --lean
+"""
+import time
+
+STARTED = time.perf_counter()
+
+import argparse
+import importlib
+import sys
+
+DEFAULT_BOOK_ID = "S000217251615"
+IMPORT_TIMES = {}
+
+
+def lazy_import(name):
+    """importlib.import_module that records how long the (first) import took."""
+    if name in sys.modules:
+        return sys.modules[name]
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    IMPORT_TIMES[name] = time.perf_counter() - started
+    return module
+
+
+def report_startup(stream=sys.stderr):
+    """One line on stderr: total import time, the heaviest imports, and the time until the command ran."""
+    imported = sum(IMPORT_TIMES.values())
+    heaviest = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in
+                         sorted(IMPORT_TIMES.items(), key=lambda item: -item[1])[:4])
+    print(f"⏱️ [CLI] imports {imported:.2f}s ({heaviest or 'stdlib only'}), "
+          f"total {time.perf_counter() - STARTED:.2f}s", file=stream)
+
+
+def read_ids(args):
+    ids = list(args.book_ids)
+    if args.file:
+        ids += read_id_file(args.file)
+    return ids
+
+
+def read_id_file(path):
+    """Same format as batch.read_book_ids, without importing batch (and with it main / selenium)."""
+    with open(path, encoding="utf-8") as f:
+        lines = [line.split("#", 1)[0].strip() for line in f]
+    return [line for line in lines if line]
+
+
+# ==================================================================
+# Subcommands
+# ==================================================================
+def open_http_cache(args):
+    if not args.http_cache:
+        return None
+    http_cache = lazy_import("http_cache")
+    return http_cache.ResponseCache(args.http_cache, ttl=args.cache_ttl, max_bytes=args.cache_max_mb * 2 ** 20)
+
+
+def open_near_dups(args):
+    if not args.near_dups:
+        return None
+    near_duplicates = lazy_import("near_duplicates")
+    return near_duplicates.NearDuplicateIndex.load(args.near_dups)
+
+
+def cmd_scrape(args):
+    main = lazy_import("main")
+    near_dups = open_near_dups(args)
+    bot = main.PalantirIntegrator(api_base_url=args.base_url, store_path=args.store, parser=args.parser,
+                                  extraction=args.extraction, headless=args.headless, lean=args.lean,
+                                  columnar_root=args.parquet, checkpoint_dir=args.checkpoint_dir,
+                                  http_cache=open_http_cache(args), near_dups=near_dups)
+    results = []
+    try:
+        for book_id in read_ids(args) or [DEFAULT_BOOK_ID]:
+            output = args.output if len(args.book_ids) <= 1 and not args.file else f"{book_id}.xlsx"
+            results.append(bot.execute_pipeline(book_id, output, engine=args.engine, max_pages=args.max_pages,
+                                                keep_browser=True, delta=args.delta, profile=args.profile,
+                                                profile_dumps=args.profile_dump or (), resume=args.resume))
+    finally:
+        bot.close()
+        if near_dups is not None:
+            near_dups.save(args.near_dups)
+    return 0 if all(r['status'] == 'ok' for r in results) else 1
+
+
+def cmd_audit(args):
+    audit = lazy_import("audit")
+    auditor = audit.LedgerAuditor(args.base_url, rate=args.rate, concurrency=args.concurrency,
+                                  page_limit=args.page_limit)
+    rows = auditor.run(read_ids(args))
+    if args.output:
+        audit.write_audit_table(rows, args.output)
+        print(f"📄 [Audit] Discrepancy table -> {args.output}")
+    audit.print_audit_summary(rows, auditor.stats)
+    return 1 if any(r['status'] != 'ok' for r in rows) else 0
+
+
+def cmd_report(args):
+    review_store = lazy_import("review_store")
+    with review_store.ReviewStore(args.store) as store:
+        if args.partitioned:
+            rows = store.export_dataset(args.output, args.book_id)
+        else:
+            rows = store.export(args.output, args.book_id)
+    print(f"📄 [Report] {rows} reviews from {args.store} -> {args.output}")
+    return 0
+
+
+def cmd_batch(args):
+    batch = lazy_import("batch")
+    near_dups = open_near_dups(args)
+    pool = None
+    if args.pool and args.engine != "api":
+        browser_pool = lazy_import("browser_pool")
+        lean_browser = lazy_import("lean_browser")
+        lean_hooks = ({'options_factory': lean_browser.lean_chrome_options, 'on_launch': lean_browser.enable_blocking}
+                      if args.lean else {})
+        pool = browser_pool.BrowserPool(size=args.workers, max_books=args.recycle_after,
+                                        max_memory_mb=args.max_browser_mb, **lean_hooks)
+    try:
+        summary, _ = batch.run_batch(args.book_ids_file, args.output_dir, args.workers, args.engine, args.max_pages,
+                                     delta=args.delta, browser_pool=pool, lean=args.lean,
+                                     checkpoint_dir=args.checkpoint_dir, resume=args.resume, near_dups=near_dups)
+    finally:
+        if pool is not None:
+            pool.close()
+        if near_dups is not None:
+            near_dups.save(args.near_dups)
+    return 0 if summary.empty or (summary['status'] == 'ok').all() else 1
+
+
+# ==================================================================
+# Parser (choices are literals so building it imports nothing)
+# ==================================================================
+ENGINES = ('selenium', 'api', 'hybrid')  # = PalantirIntegrator.ENGINES
+PROFILE_DUMPS = ('cprofile', 'tracemalloc')  # = profiling.PROFILE_DUMPS
+KYOBO_HOST = "https://product.kyobobook.co.kr"
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Kyobo review integrator.")
+    parser.add_argument("--quiet-timing", action="store_true", help="Do not print the CLI import/startup time")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_ids(p):
+        p.add_argument("book_ids", nargs="*", help="Book IDs (saleCmdtid)")
+        p.add_argument("--file", help="Text file with one book ID per line ('#' comments allowed)")
+
+    p = sub.add_parser("scrape", help="Full pipeline: ledger, sort, extraction, report")
+    add_ids(p)
+    p.add_argument("-o", "--output", default="Final_Integrated_Report.xlsx")
+    p.add_argument("--engine", choices=ENGINES, default="selenium")
+    p.add_argument("--max-pages", type=int, default=50)
+    p.add_argument("--delta", action="store_true", help="Only collect reviews newer than the saved watermark")
+    p.add_argument("--store", help="SQLite review store to upsert into (reports are built from it)")
+    p.add_argument("--parser", default="auto", help="HTML backend: auto / selectolax / lxml / bs4")
+    p.add_argument("--extraction", choices=('html', 'js'), default="html")
+    p.add_argument("--headless", action="store_true")
+    p.add_argument("--lean", action="store_true", help="Headless, no images/fonts/media/analytics requests")
+    p.add_argument("--profile", help="Write the step / per-page timing report (JSON) here")
+    p.add_argument("--profile-dump", action="append", choices=PROFILE_DUMPS,
+                   help="Also write a cProfile (.prof) / tracemalloc (.tracemalloc.txt) dump next to --profile")
+    p.add_argument("--parquet", help="Also append typed rows to this Parquet dataset (partitioned by book/crawl date)")
+    p.add_argument("--checkpoint-dir", help="Per-page progress of every book (off unless set; --resume reads it)")
+    p.add_argument("--resume", action="store_true", help="Continue interrupted books from their last saved page")
+    p.add_argument("--http-cache", metavar="DIR", help="On-disk response cache for the api / hybrid engines")
+    p.add_argument("--cache-ttl", type=float, default=0,
+                   help="Seconds a cached response is replayed without asking the server (0 = revalidate via ETag)")
+    p.add_argument("--cache-max-mb", type=int, default=256, help="Cache size cap (least recently used evicted)")
+    p.add_argument("--near-dups", metavar="PATH", help="Near-duplicate index (.npz): flag reviews copied across books")
+    p.add_argument("--base-url", default=KYOBO_HOST)
+    p.set_defaults(func=cmd_scrape)
+
+    p = sub.add_parser("audit", help="Ledger vs physical count per book (no content extraction)")
+    add_ids(p)
+    p.add_argument("-o", "--output", help="Discrepancy table (.csv / .xlsx)")
+    p.add_argument("--rate", type=float, default=5.0, help="Requests per second per host")
+    p.add_argument("--concurrency", type=int, default=8)
+    p.add_argument("--page-limit", type=int, default=100)
+    p.add_argument("--base-url", default=KYOBO_HOST)
+    p.set_defaults(func=cmd_audit)
+
+    p = sub.add_parser("report", help="Export stored reviews (.xlsx / .csv / .jsonl / .parquet) without scraping")
+    p.add_argument("-o", "--output", required=True)
+    p.add_argument("--partitioned", action="store_true",
+                   help="Treat --output as a Parquet dataset root partitioned by book_id / crawl_date")
+    p.add_argument("--store", default="reviews.db")
+    p.add_argument("--book-id", help="Only this book (default: every stored book)")
+    p.set_defaults(func=cmd_report)
+
+    p = sub.add_parser("batch", help="Many books across N reusable workers")
+    p.add_argument("book_ids_file", help="Text file with one book ID per line")
+    p.add_argument("--workers", type=int, default=2)
+    p.add_argument("--engine", choices=ENGINES, default="selenium")
+    p.add_argument("--max-pages", type=int, default=50)
+    p.add_argument("--output-dir", default="batch_output")
+    p.add_argument("--delta", action="store_true")
+    p.add_argument("--pool", action="store_true", help="Share a pool of warm headless browsers")
+    p.add_argument("--recycle-after", type=int, default=25)
+    p.add_argument("--max-browser-mb", type=int, default=1500)
+    p.add_argument("--lean", action="store_true")
+    p.add_argument("--checkpoint-dir", help="Per-page progress of every book (off unless set; --resume reads it)")
+    p.add_argument("--resume", action="store_true", help="Continue interrupted books from their last saved page")
+    p.add_argument("--near-dups", metavar="PATH", help="Near-duplicate index (.npz): flag reviews copied across books")
+    p.set_defaults(func=cmd_batch)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, 'profile_dump', None) and not args.profile:
+        parser.error("--profile-dump needs --profile (the dumps are written next to it)")
+    try:
+        return args.func(args)
+    finally:
+        if not args.quiet_timing:
+            report_startup()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+import datetime
+import os
+import time
+import uuid
+
+# Optional: typed columnar export needs pyarrow (pip install pyarrow); everything else works without it
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Report columns (strings from the scrapers) -> typed columnar fields
+COLUMN_MAP = {'Book ID': 'book_id', 'Page': 'page', 'Writer': 'writer', 'Date': 'date', 'Rating': 'rating',
+              'Likes': 'likes', 'Content': 'content'}
+
+if pa is not None:
+    REVIEW_SCHEMA = pa.schema([
+        ('book_id', pa.string()),
+        ('page', pa.int16()),
+        ('writer', pa.dictionary(pa.int32(), pa.string())),
+        ('date', pa.date32()),
+        ('rating', pa.int8()),
+        ('likes', pa.int32()),
+        ('content', pa.string()),
+        ('crawl_date', pa.date32()),
+    ])
+    # Hive layout: <root>/book_id=S000.../crawl_date=2026-10-18/part-<uuid>-0.parquet
+    PARTITIONING = ds.partitioning(pa.schema([('book_id', pa.string()), ('crawl_date', pa.date32())]),
+                                   flavor="hive")
+
+
+def require_arrow():
+    if pa is None:
+        raise ImportError("Columnar export needs pyarrow: pip install pyarrow")
+
+
+def _int_column(values, type_):
+    """'1,234' -> 1234; anything that is not a plain integer ('Unknown', '4.5', '') becomes null."""
+    if pa.types.is_integer(values.type):
+        return pc.cast(values, type_)
+    text = pc.replace_substring(pc.utf8_trim_whitespace(pc.cast(values, pa.string())), ",", "")
+    valid = pc.match_substring_regex(text, r"^-?\d+$")
+    return pc.cast(pc.if_else(valid, text, pa.scalar(None, pa.string())), type_)
+
+
+def _date_column(values):
+    """'2025.03.28' / '2025-03-28' -> date32; 'Unknown' -> null."""
+    text = pc.replace_substring(pc.cast(values, pa.string()), "-", ".")
+    return pc.cast(pc.strptime(text, format="%Y.%m.%d", unit="s", error_is_null=True), pa.date32())
+
+
+def to_arrow(data, book_id=None, crawl_date=None):
+    """[Arrow Handoff] Report rows (DataFrame or iterable of dicts, string values) -> typed pa.Table.
+
+    Parsing is vectorised (pyarrow.compute), so a million rows convert in about a second.
+    book_id fills the column when the rows do not carry a 'Book ID'; crawl_date defaults to today.
+    """
+    if hasattr(data, "columns"):
+        columns = {name: data[name].tolist() for name in data.columns}
+    else:
+        rows = list(data)
+        names = rows[0].keys() if rows else COLUMN_MAP.keys()
+        columns = {name: [row.get(name) for row in rows] for name in names}
+    return columns_to_arrow(columns, book_id, crawl_date)
+
+
+def columns_to_arrow(columns, book_id=None, crawl_date=None):
+    """Same as to_arrow for {report column: list of values} (e.g. straight from a SQL cursor)."""
+    require_arrow()
+    n = len(next(iter(columns.values()), []))
+
+    def raw(name):
+        if name not in columns:
+            return pa.nulls(n, pa.string())
+        try:
+            return pa.array(columns[name])
+        except (pa.ArrowInvalid, pa.ArrowTypeError):  # mixed '10' / 10 -> compare as text
+            return pa.array([None if v is None else str(v) for v in columns[name]], pa.string())
+
+    book_ids = (pa.array(columns['Book ID'], pa.string()) if 'Book ID' in columns
+                else pa.array([book_id] * n, pa.string()))
+    crawl = crawl_date or datetime.date.today()
+    crawl_dates = (_date_column(pa.array(columns['Crawl Date'], pa.string())) if 'Crawl Date' in columns
+                   else pa.array([crawl] * n, pa.date32()))
+    return pa.table({
+        'book_id': book_ids,
+        'page': _int_column(raw('Page'), pa.int16()),
+        'writer': pc.dictionary_encode(pc.cast(raw('Writer'), pa.string())).cast(REVIEW_SCHEMA.field('writer').type),
+        'date': _date_column(raw('Date')),
+        'rating': _int_column(raw('Rating'), pa.int8()),
+        'likes': _int_column(raw('Likes'), pa.int32()),
+        'content': pc.cast(raw('Content'), pa.string()),
+        'crawl_date': crawl_dates,
+    }, schema=REVIEW_SCHEMA)
+
+
+def write_parquet(table, path):
+    """One Parquet file (zstd) -- e.g. a single-book export."""
+    require_arrow()
+    pq.write_table(table, path, compression="zstd")
+    return table.num_rows
+
+
+def write_dataset(table, root):
+    """Merge `table` into a Parquet dataset partitioned by book_id / crawl_date.
+
+    crawl_date means the day a review was first collected (ReviewStore.to_arrow: first_seen), so every
+    review is stored once: rows the dataset already holds under an earlier crawl_date are skipped, and
+    each (book_id, crawl_date) partition that is left to write is rewritten as one de-duplicated set (the
+    new row wins). Re-running a book -- on the same day or later -- or exporting a store's full history
+    again never piles up copies.
+    """
+    require_arrow()
+    started = time.perf_counter()
+    existing = _existing_books(table, root)
+    fresh = _drop_seen_before(table, existing)
+    merged = _dedup(pa.concat_tables([fresh, _partitions_of(existing, fresh)]))
+    if merged.num_rows:
+        ds.write_dataset(merged, root, format="parquet", partitioning=PARTITIONING,
+                         basename_template=f"part-{uuid.uuid4().hex[:12]}-{{i}}.parquet",
+                         existing_data_behavior="delete_matching",
+                         file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"))
+    print(f"✨ [Success] Parquet dataset updated: {root} "
+          f"({table.num_rows} rows in, {table.num_rows - fresh.num_rows} already stored on an earlier day, "
+          f"{merged.num_rows} in the rewritten partitions, {time.perf_counter() - started:.2f}s)")
+    return fresh.num_rows
+
+
+def _existing_books(table, root):
+    """Every row already stored for the books in `table` (partition pruning: only their directories)."""
+    if not os.path.isdir(root) or table.num_rows == 0:
+        return REVIEW_SCHEMA.empty_table()
+    dataset = ds.dataset(root, format="parquet", partitioning=PARTITIONING)
+    existing = dataset.to_table(filter=ds.field('book_id').isin(pc.unique(table['book_id'])))
+    return existing.select(REVIEW_SCHEMA.names).cast(REVIEW_SCHEMA)
+
+
+def _review_keys(table):
+    """One string per review: book_id / writer / date / content, unit-separated."""
+    parts = [pc.fill_null(part, "") for part in (table['book_id'], pc.cast(table['writer'], pa.string()),
+                                                 pc.cast(table['date'], pa.string()), table['content'])]
+    return pc.binary_join_element_wise(*parts, "\x1f")
+
+
+def _drop_seen_before(table, existing):
+    """Rows of `table` whose review is not already stored under an earlier crawl_date."""
+    if existing.num_rows == 0:
+        return table
+    first = (pa.table({'_key': _review_keys(existing), 'crawl_date': existing['crawl_date']})
+             .group_by('_key', use_threads=False).aggregate([('crawl_date', 'min')]))
+    position = pc.index_in(_review_keys(table), value_set=first['_key'])
+    earlier = pc.less(pc.take(first['crawl_date_min'], position), table['crawl_date'])
+    return table.filter(pc.invert(pc.fill_null(earlier, False)))
+
+
+def _partitions_of(existing, table):
+    """Rows of `existing` under the (book_id, crawl_date) partitions `table` is about to replace."""
+    if existing.num_rows == 0 or table.num_rows == 0:
+        return REVIEW_SCHEMA.empty_table()
+    keys = pc.binary_join_element_wise(existing['book_id'], pc.cast(existing['crawl_date'], pa.string()), "|")
+    wanted = pc.unique(pc.binary_join_element_wise(table['book_id'], pc.cast(table['crawl_date'], pa.string()), "|"))
+    return existing.filter(pc.is_in(keys, value_set=wanted))
+
+
+def _dedup(table):
+    """First occurrence of every (book_id, crawl_date, writer, date, content) row, in table order."""
+    keys = ['book_id', 'crawl_date', 'writer', 'date', 'content']
+    indexed = pa.table({key: table[key] for key in keys}).append_column('_row', pa.array(range(table.num_rows)))
+    indexed = indexed.set_column(indexed.schema.get_field_index('writer'), 'writer',
+                                 pc.cast(indexed['writer'], pa.string()))
+    first = indexed.group_by(keys, use_threads=False).aggregate([('_row', 'min')])['_row_min']
+    return table.take(first.take(pc.sort_indices(first)))
+
+
+def read_dataset(root, book_id=None, since=None):
+    """Load a partitioned dataset back as a pa.Table (optionally one book / crawls since a date).
+    Partition pruning means only the matching directories are opened."""
+    require_arrow()
+    dataset = ds.dataset(root, format="parquet", partitioning=PARTITIONING)
+    condition = None
+    if book_id is not None:
+        condition = ds.field('book_id') == book_id
+    if since is not None:
+        since_filter = ds.field('crawl_date') >= pa.scalar(since, pa.date32())
+        condition = since_filter if condition is None else condition & since_filter
+    return dataset.to_table(filter=condition)
+
+
+def export_table(table, path):
+    """'.parquet' -> one file, anything else -> partitioned dataset root."""
+    if os.path.splitext(path)[1].lower() == ".parquet":
+        return write_parquet(table, path)
+    return write_dataset(table, path)
@@ -0,0 +1,286 @@
+import time
+
+from bs4 import BeautifulSoup
+
+# Optional fast parsers: used when installed, BeautifulSoup stays the always-available fallback
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser  # selectolax < 0.3.13 only ships the Modest backend
+    except ImportError:
+        HTMLParser = None
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+# JS that hands back only the review list container instead of the whole document
+REVIEW_LIST_JS = """
+var el = document.querySelector('.comment_list');
+return el ? el.outerHTML : null;
+"""
+
+# [Single Round-Trip] Every field computed in the page with the same selectors and defaults as the parsers.
+# Returns [[writer, date, rating, likes, content], ...] so only a compact JSON array crosses the wire.
+EXTRACT_REVIEWS_JS = """
+function joined(el) {  // BeautifulSoup get_text(" ", strip=True)
+    var walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT), parts = [], node;
+    while ((node = walker.nextNode())) {
+        var t = node.nodeValue.trim();
+        if (t) parts.push(t);
+    }
+    return parts.join(" ");
+}
+var root = document.querySelector('.comment_list') || document;
+return Array.prototype.map.call(root.querySelectorAll('.comment_item'), function (item) {
+    var text = item.querySelector('.comment_text');
+    var rating = item.querySelector('.rating-input');
+    var info = item.querySelectorAll('.user_info_box .info_item');
+    var likes = item.querySelector('.btn_like .text');
+    return [
+        info.length > 0 ? info[0].textContent.trim() : "Anonymous",
+        info.length > 1 ? info[1].textContent.trim() : "Unknown",
+        rating && rating.getAttribute('value') !== null ? rating.getAttribute('value') : "0",
+        likes ? likes.textContent.trim() : "0",
+        text ? joined(text) : "No Content"
+    ];
+});
+"""
+
+# [Ledger Probe] get_claimed_count's strategies, in the same priority order, evaluated in one execute_script:
+# 1. per keyword: //*[contains(text(), kw) and contains(text(), '(')] -> first displayed "(N)"
+# 2. displayed .count element whose text is all digits
+LEDGER_KEYWORDS = ['리뷰', '전체', 'Klover', 'Review']
+LEDGER_PROBE_JS = """
+var keywords = arguments[0], checked = 0;
+function displayed(el) {  // close to WebElement.is_displayed(): laid out and not hidden
+    if (!el.getClientRects().length) return false;
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none' && style.opacity !== '0';
+}
+for (var k = 0; k < keywords.length; k++) {
+    var xpath = "//*[contains(text(), '" + keywords[k] + "') and contains(text(), '(')]";
+    var hits = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (var i = 0; i < hits.snapshotLength; i++) {
+        var el = hits.snapshotItem(i);
+        checked++;
+        if (!displayed(el)) continue;
+        var match = /\\((\\d+)\\)/.exec(el.innerText.trim());
+        if (match) return {count: parseInt(match[1], 10), strategy: 'keyword:' + keywords[k], checked: checked};
+    }
+}
+var counts = document.querySelectorAll('.count');
+for (var j = 0; j < counts.length; j++) {
+    checked++;
+    var text = counts[j].innerText.trim();
+    if (displayed(counts[j]) && /^\\d+$/.test(text)) return {count: parseInt(text, 10), strategy: 'css:.count', checked: checked};
+}
+return {count: 0, strategy: null, checked: checked};
+"""
+
+EXTRACTION_MODES = ('html', 'js')
+
+
+def available_backends():
+    backends = []
+    if HTMLParser is not None:
+        backends.append('selectolax')
+    if lxml is not None:
+        backends.append('lxml')
+    backends.append('bs4')
+    return backends
+
+
+def resolve_backend(backend="auto"):
+    if backend == "auto":
+        return available_backends()[0]
+    if backend not in available_backends():
+        print(f"   >> [Parser] '{backend}' is not installed. (Falling back to BeautifulSoup)")
+        return 'bs4'
+    return backend
+
+
+def make_review(page, writer, date, rating, likes, content):
+    return {'Page': page, 'Writer': writer, 'Date': date, 'Rating': rating, 'Likes': likes, 'Content': content}
+
+
+# ==================================================================
+# Backends: same selectors and same defaults as the original BeautifulSoup loop
+# ==================================================================
+def _parse_bs4(html, page):
+    rows = []
+    for item in BeautifulSoup(html, 'html.parser').select(".comment_item"):
+        try: content = item.select_one(".comment_text").get_text(" ", strip=True)
+        except: content = "No Content"
+
+        try: rating = item.select_one(".rating-input")['value']
+        except: rating = "0"
+
+        try:
+            info = item.select(".user_info_box .info_item")
+            writer = info[0].text.strip() if len(info) > 0 else "Anonymous"
+            date = info[1].text.strip() if len(info) > 1 else "Unknown"
+        except: writer = "Anonymous"; date = "Unknown"
+
+        try: likes = item.select_one(".btn_like .text").text.strip()
+        except: likes = "0"
+
+        rows.append(make_review(page, writer, date, rating, likes, content))
+    return rows
+
+
+def _selectolax_joined_text(node):
+    """selectolax version of BeautifulSoup get_text(' ', strip=True): text(separator=" ", strip=True) keeps
+    whitespace-only nodes (indentation between tags) as extra spaces, which would change review_key."""
+    texts = (child.text(deep=False).strip() for child in node.traverse(include_text=True) if child.tag == "-text")
+    return " ".join(t for t in texts if t)
+
+
+def _parse_selectolax(html, page):
+    rows = []
+    for item in HTMLParser(html).css(".comment_item"):
+        node = item.css_first(".comment_text")
+        content = _selectolax_joined_text(node) if node is not None else "No Content"
+
+        node = item.css_first(".rating-input")
+        rating = node.attributes.get('value') if node is not None else None
+        rating = rating if rating is not None else "0"
+
+        info = item.css(".user_info_box .info_item")
+        writer = info[0].text().strip() if len(info) > 0 else "Anonymous"
+        date = info[1].text().strip() if len(info) > 1 else "Unknown"
+
+        node = item.css_first(".btn_like .text")
+        likes = node.text().strip() if node is not None else "0"
+
+        rows.append(make_review(page, writer, date, rating, likes, content))
+    return rows
+
+
+def _cls(name):
+    """XPath predicate equivalent to the CSS class selector '.name' (no cssselect dependency)."""
+    return f"[contains(concat(' ', normalize-space(@class), ' '), ' {name} ')]"
+
+
+def _joined_text(el):
+    """lxml version of BeautifulSoup get_text(' ', strip=True)."""
+    return " ".join(t.strip() for t in el.itertext() if t.strip())
+
+
+def _parse_lxml(html, page):
+    rows = []
+    root = lxml.html.fromstring(html)
+    for item in root.xpath(f"descendant-or-self::*{_cls('comment_item')}"):
+        nodes = item.xpath(f".//*{_cls('comment_text')}")
+        content = _joined_text(nodes[0]) if nodes else "No Content"
+
+        nodes = item.xpath(f".//*{_cls('rating-input')}")
+        rating = nodes[0].get('value') if nodes else None
+        rating = rating if rating is not None else "0"
+
+        info = item.xpath(f".//*{_cls('user_info_box')}//*{_cls('info_item')}")
+        writer = info[0].text_content().strip() if len(info) > 0 else "Anonymous"
+        date = info[1].text_content().strip() if len(info) > 1 else "Unknown"
+
+        nodes = item.xpath(f".//*{_cls('btn_like')}//*{_cls('text')}")
+        likes = nodes[0].text_content().strip() if nodes else "0"
+
+        rows.append(make_review(page, writer, date, rating, likes, content))
+    return rows
+
+
+BACKENDS = {'bs4': _parse_bs4, 'selectolax': _parse_selectolax, 'lxml': _parse_lxml}
+
+
+def parse_reviews_html(html, page, backend="auto"):
+    """Parse every .comment_item in `html` (a fragment or a full page) into review rows."""
+    return BACKENDS[resolve_backend(backend)](html, page)
+
+
+def review_list_html(driver):
+    """Only the .comment_list outerHTML (falls back to the full page_source if the container is missing)."""
+    return driver.execute_script(REVIEW_LIST_JS) or driver.page_source
+
+
+def extract_reviews_js(driver, page):
+    """One execute_script per page: no HTML serialization, no Python-side DOM walk."""
+    return [make_review(page, *fields) for fields in driver.execute_script(EXTRACT_REVIEWS_JS) or []]
+
+
+def probe_ledger(driver, keywords=LEDGER_KEYWORDS):
+    """One round trip for the whole ledger audit: {'count', 'strategy', 'checked', 'ms'}."""
+    started = time.perf_counter()
+    result = driver.execute_script(LEDGER_PROBE_JS, list(keywords)) or {'count': 0, 'strategy': None, 'checked': 0}
+    result['ms'] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+def extract_reviews(driver, page, mode="html", backend="auto"):
+    if mode == "js":
+        return extract_reviews_js(driver, page)
+    return parse_reviews_html(review_list_html(driver), page, backend)
+
+
+def benchmark_extraction(driver, repeat=5):
+    """Per-page latency (ms) of each extraction path on the page currently loaded in `driver`."""
+    paths = {
+        'page_source + bs4': lambda: _parse_bs4(driver.page_source, 1),
+        'fragment + ' + resolve_backend(): lambda: parse_reviews_html(review_list_html(driver), 1),
+        'in-browser js': lambda: extract_reviews_js(driver, 1),
+    }
+    results = {}
+    for name, extract in paths.items():
+        started = time.perf_counter()
+        for _ in range(repeat):
+            extract()
+        results[name] = round((time.perf_counter() - started) * 1000 / repeat, 2)
+    return results
+
+
+# ==================================================================
+# Micro-benchmark: per-page parse time for each backend over saved pages
+# ==================================================================
+def benchmark_parsers(pages, repeat=20):
+    """pages: list of HTML strings. Returns {backend: ms per page} (rows are checked to be identical)."""
+    results = {}
+    reference = None
+    for backend in available_backends():
+        parse = BACKENDS[backend]
+        rows = [parse(html, 1) for html in pages]
+        if reference is None:
+            reference = rows
+        elif rows != reference:
+            print(f"   ⚠️ [Bench] {backend} output differs from {available_backends()[0]}")
+
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for html in pages:
+                parse(html, 1)
+        results[backend] = round((time.perf_counter() - started) * 1000 / (repeat * len(pages)), 3)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Per-page parse time of each HTML backend.")
+    parser.add_argument("html_files", nargs="*", help="Saved Kyobo pages (full page_source or .comment_list fragment)")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.html_files:
+        inputs = []
+        for path in args.html_files:
+            with open(path, encoding="utf-8") as f:
+                inputs.append((path, f.read()))
+    else:
+        from replay_server import render_detail_page, render_review_list, synthetic_reviews
+        fragment = render_review_list(synthetic_reviews(10))
+        inputs = [("synthetic page_source", render_detail_page(fragment)), ("synthetic .comment_list", fragment)]
+        print("--- [Bench] No files given: using a synthetic full page and its .comment_list fragment ---")
+
+    for label, html in inputs:
+        print(f"\n📄 {label} ({len(html) / 1024:.0f} KB)")
+        for backend, ms in benchmark_parsers([html], args.repeat).items():
+            print(f"   {backend:<11}: {ms:.3f} ms/page")
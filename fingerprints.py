@@ -0,0 +1,63 @@
+import hashlib
+import struct
+
+
+def review_fingerprint(writer, date, content):
+    """Stable 64-bit fingerprint of one review -- same identity as drop_duplicates(['Writer', 'Date', 'Content'])."""
+    key = f"{writer}\x1f{date}\x1f{content}".encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+def review_key(writer, date, content):
+    """review_fingerprint as 16 hex digits -- the form stored in SQLite / JSON (no unsigned 64-bit integers there).
+    Used as the review store key and the delta watermark, so every component agrees on one identity."""
+    return format(review_fingerprint(writer, date, content), "016x")
+
+
+def row_fingerprint(row):
+    return review_fingerprint(row['Writer'], row['Date'], row['Content'])
+
+
+def page_fingerprint(rows):
+    """16-hex digest of one page: its review fingerprints, in order (a resumed run checks it lands on the same page)."""
+    packed = struct.pack(f"<{len(rows)}Q", *map(row_fingerprint, rows))
+    return hashlib.blake2b(packed, digest_size=8).hexdigest()
+
+
+class StreamingDeduper:
+    """[Dedup] Drops duplicate reviews the moment a page is parsed (a set of 64-bit fingerprints).
+
+    check(rows) classifies each page against everything seen before:
+      'new'     -- no review seen yet
+      'overlap' -- some reviews were already collected (the list shifted while paging); they are dropped
+      'repeat'  -- nothing new: the same page came back (click did not advance / past the end) -> stop
+    last_fingerprint: page_fingerprint of the whole page last checked, before any row was dropped
+    (what a checkpoint stores, so a resume compares it with the page as re-read).
+    """
+
+    def __init__(self, rows=()):
+        self.seen = set(map(row_fingerprint, rows))
+        self.pages = set()
+        self.dropped = 0
+        self.last_fingerprint = None
+
+    def check(self, rows):
+        """-> (fresh rows in page order, status)"""
+        fingerprints = [row_fingerprint(row) for row in rows]
+        page = hashlib.blake2b(struct.pack(f"<{len(rows)}Q", *fingerprints), digest_size=8).digest()
+        self.last_fingerprint = page.hex()
+        if page in self.pages:
+            self.dropped += len(rows)
+            return [], 'repeat'
+        self.pages.add(page)
+
+        fresh = []
+        seen = self.seen
+        for row, fingerprint in zip(rows, fingerprints):
+            if fingerprint not in seen:
+                seen.add(fingerprint)
+                fresh.append(row)
+        self.dropped += len(rows) - len(fresh)
+        if not fresh and rows:
+            return fresh, 'repeat'
+        return fresh, 'overlap' if len(fresh) < len(rows) else 'new'
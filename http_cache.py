@@ -0,0 +1,242 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "palantir", "http")
+# Bodies are stored decoded, so transfer-level headers must not be replayed with them
+DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'set-cookie'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key           TEXT PRIMARY KEY,   -- sha256(METHOD + canonical URL)
+    url           TEXT NOT NULL,
+    status        INTEGER NOT NULL,
+    headers       TEXT NOT NULL,
+    body_hash     TEXT NOT NULL,      -- sha256 of the body -> bodies/<2>/<hash> (shared by identical bodies)
+    size          INTEGER NOT NULL,   -- compressed bytes on disk
+    ttl           REAL NOT NULL,
+    stored_at     REAL NOT NULL,
+    expires_at    REAL NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    last_access   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_lru ON entries (last_access);
+"""
+
+
+def cache_key(method, url):
+    """sha256 of METHOD + URL with the query parameters sorted (param order never splits an entry)."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    canonical = urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, query, ""))
+    return hashlib.sha256(f"{method.upper()} {canonical}".encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """[HTTP Cache] On-disk GET response cache: SQLite index + content-addressed, zlib-compressed bodies.
+
+    Fresh entries (younger than their TTL) are replayed without touching the network. Stale entries
+    that carried an ETag / Last-Modified are revalidated with a conditional request (304 -> the stored
+    body is reused and the TTL restarts); without validators they are simply fetched again.
+    The default TTL is 0: review lists change whenever someone posts, so every request is revalidated and
+    the cache only saves the body transfer. A request sent with 'Cache-Control: no-cache' is revalidated
+    even while its entry is fresh (delta runs, see KyoboReviewAPI.revalidate).
+    When the bodies exceed max_bytes, the least recently used entries are evicted.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, ttl=0, max_bytes=256 * 2 ** 20):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(directory, "bodies"), exist_ok=True)
+        # Shared by the threads of one session (batch workers / async executor), so guard with a lock
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(directory, "index.db"), check_same_thread=False,
+                                    isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.stats = dict.fromkeys(('hits', 'revalidated', 'misses', 'stored', 'evicted', 'network'), 0)
+
+    def _body_path(self, body_hash):
+        return os.path.join(self.directory, "bodies", body_hash[:2], body_hash)
+
+    def count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def lookup(self, key):
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if not os.path.exists(self._body_path(row['body_hash'])):
+                self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            self.conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            return dict(row)
+
+    def store(self, key, response, ttl=None):
+        """Keep a 200 response (its body is read here, so the caller must not be streaming)."""
+        ttl = self.ttl if ttl is None else ttl
+        body = response.content
+        body_hash = hashlib.sha256(body).hexdigest()
+        path = self._body_path(body_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(zlib.compress(body, 6))
+            os.replace(tmp_path, path)
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS}
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, response.url, response.status_code, json.dumps(headers), body_hash, os.path.getsize(path),
+                 ttl, now, now + ttl, response.headers.get('ETag'), response.headers.get('Last-Modified'), now))
+            self.stats['stored'] += 1
+            self._evict_lru()
+
+    def refresh(self, key):
+        """304 Not Modified: the stored body is still valid, restart its TTL."""
+        now = time.time()
+        with self._lock:
+            self.conn.execute("UPDATE entries SET expires_at = ? + ttl, last_access = ? WHERE key = ?",
+                              (now, now, key))
+
+    def evict(self, key):
+        with self._lock:
+            row = self.conn.execute("SELECT body_hash FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._drop_body(row['body_hash'])
+
+    def _drop_body(self, body_hash):
+        if self.conn.execute("SELECT 1 FROM entries WHERE body_hash = ? LIMIT 1", (body_hash,)).fetchone() is None:
+            try:
+                os.remove(self._body_path(body_hash))
+            except FileNotFoundError:
+                pass
+
+    def _total_bytes(self):
+        return self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT body_hash, size FROM entries)").fetchone()[0]
+
+    def _evict_lru(self):
+        total = self._total_bytes()
+        if total <= self.max_bytes:
+            return
+        for row in self.conn.execute("SELECT key, body_hash FROM entries ORDER BY last_access").fetchall():
+            self.conn.execute("DELETE FROM entries WHERE key = ?", (row['key'],))
+            self._drop_body(row['body_hash'])
+            self.stats['evicted'] += 1
+            total = self._total_bytes()
+            if total <= self.max_bytes:
+                break
+
+    def build_response(self, entry, request):
+        """requests.Response rebuilt from an entry (response.from_cache is True)."""
+        with open(self._body_path(entry['body_hash']), "rb") as f:
+            body = zlib.decompress(f.read())
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.headers = CaseInsensitiveDict(json.loads(entry['headers']))
+        response._content = body
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.reason = "OK (cached)"
+        response.from_cache = True
+        response.revalidated = False
+        return response
+
+    def clear(self):
+        with self._lock:
+            for row in self.conn.execute("SELECT DISTINCT body_hash FROM entries").fetchall():
+                try:
+                    os.remove(self._body_path(row['body_hash']))
+                except FileNotFoundError:
+                    pass
+            self.conn.execute("DELETE FROM entries")
+
+    def summary(self):
+        """Hit / miss statistics of this process plus what is on disk."""
+        with self._lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            size = self._total_bytes()
+        stats = self.stats
+        lookups = stats['hits'] + stats['revalidated'] + stats['misses']
+        hit_rate = (stats['hits'] + stats['revalidated']) / lookups * 100 if lookups else 0.0
+        print(f"   🗄️ [HTTP Cache] {stats['hits']} hits, {stats['revalidated']} revalidated (304), "
+              f"{stats['misses']} misses -> {hit_rate:.0f}% served from cache, {stats['network']} network calls; "
+              f"{entries} entries, {size / 2 ** 20:.1f} MB on disk ({stats['evicted']} evicted)")
+        return {**stats, 'entries': entries, 'bytes': size, 'hit_rate': round(hit_rate, 1)}
+
+    def close(self):
+        self.conn.close()
+
+
+class CachingAdapter(HTTPAdapter):
+    """HTTPAdapter that answers GETs from a ResponseCache (mounted by kyobo_api.build_session(cache=...))."""
+
+    def __init__(self, cache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request, stream=False, **kwargs):
+        if request.method != "GET" or stream:
+            return super().send(request, stream=stream, **kwargs)
+        key = cache_key(request.method, request.url)
+        entry = self.cache.lookup(key)
+        no_cache = 'no-cache' in request.headers.get('Cache-Control', '')
+        if entry is not None and entry['expires_at'] > time.time() and not no_cache:
+            self.cache.count('hits')
+            return self.cache.build_response(entry, request)
+
+        if entry is not None:
+            if entry['etag']:
+                request.headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                request.headers['If-Modified-Since'] = entry['last_modified']
+        response = super().send(request, stream=stream, **kwargs)
+        response.from_cache = False
+        self.cache.count('network')
+        if response.status_code == 304 and entry is not None:
+            self.cache.refresh(key)
+            self.cache.count('revalidated')
+            cached = self.cache.build_response(entry, request)
+            cached.revalidated = True  # body from disk, but the server was asked
+            return cached
+
+        self.cache.count('misses')
+        if response.status_code == 200:
+            self.cache.store(key, response)
+        return response
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or empty the on-disk HTTP response cache.")
+    parser.add_argument("directory", nargs="?", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--clear", action="store_true")
+    args = parser.parse_args()
+
+    cache = ResponseCache(args.directory)
+    if args.clear:
+        cache.clear()
+        print(f"🧹 [HTTP Cache] Cleared {args.directory}")
+    cache.summary()
+    cache.close()
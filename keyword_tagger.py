@@ -0,0 +1,101 @@
+import json
+import os
+from collections import deque
+
+from report_writer import HIGHLIGHT_KEYWORDS
+
+DEFAULT_LEXICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lexicons.json")
+
+
+class AhoCorasick:
+    """Multi-keyword automaton: built once, then every text is scanned in a single left-to-right pass
+    (linear in text length + matches, no matter how many terms are loaded)."""
+
+    def __init__(self, terms):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for term in terms:
+            self._add(term)
+        self._link()
+
+    def _add(self, term):
+        state = 0
+        for ch in term:
+            if ch not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.goto[state][ch] = len(self.goto) - 1
+            state = self.goto[state][ch]
+        if term not in self.output[state]:
+            self.output[state].append(term)
+
+    def _link(self):
+        """Breadth-first pass computing failure links; outputs are merged so matching never walks back."""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[nxt] = self.goto[fallback].get(ch, 0)
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    def iter_matches(self, text):
+        """Yield (start, term) for every occurrence, overlapping ones included."""
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for term in output[state]:
+                yield i - len(term) + 1, term
+
+
+class KeywordTagger:
+    """[Keyword Tagging] Lexicons (translation, readability, delivery, ...) compiled into one automaton.
+
+    Each review is scanned exactly once; the result feeds both report highlighting and analytics.
+    """
+
+    def __init__(self, lexicons, highlight=None):
+        self.lexicons = {name: [t.casefold() for t in terms] for name, terms in lexicons.items()}
+        self.highlight = list(highlight if highlight is not None else lexicons)
+        self.term_lexicons = {}
+        for name, terms in self.lexicons.items():
+            for term in terms:
+                self.term_lexicons.setdefault(term, []).append(name)
+        self.automaton = AhoCorasick(self.term_lexicons)
+
+    @classmethod
+    def from_config(cls, path=DEFAULT_LEXICON_PATH):
+        """Load {"highlight": [...], "lexicons": {name: [terms]}}; without a config fall back to the
+        original six highlight keywords."""
+        if not os.path.exists(path):
+            return cls({'keywords': HIGHLIGHT_KEYWORDS})
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+        return cls(config['lexicons'], config.get('highlight'))
+
+    def tag(self, text):
+        """{lexicon: [(term, start), ...]} for one text."""
+        hits = {}
+        for start, term in self.automaton.iter_matches(str(text).casefold()):
+            for name in self.term_lexicons[term]:
+                hits.setdefault(name, []).append((term, start))
+        return hits
+
+    def tag_frame(self, df, column='Content'):
+        """Add 'Tags', 'Keyword Hits' (term@position) and one 'tag_<lexicon>' hit count per lexicon."""
+        df = df.copy()
+        results = [self.tag(text) for text in df[column]]
+        df['Tags'] = [",".join(name for name in self.lexicons if name in hits) for hits in results]
+        df['Keyword Hits'] = ["; ".join(f"{term}@{start}" for name in self.lexicons for term, start in hits.get(name, []))
+                              for hits in results]
+        for name in self.lexicons:
+            df[f"tag_{name}"] = [len(hits.get(name, [])) for hits in results]
+        return df
@@ -0,0 +1,252 @@
+import re
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from fingerprints import StreamingDeduper, page_fingerprint, review_key
+from profiling import PipelineProfiler
+from records import ReviewBatch
+
+KYOBO_HOST = "https://product.kyobobook.co.kr"
+REVIEW_COLUMNS = ['Page', 'Writer', 'Date', 'Rating', 'Likes', 'Content']
+
+# Same camouflage headers that v1 used against the review-list API
+API_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Referer': KYOBO_HOST + "/",
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7'
+}
+
+
+class BlockedResponseError(Exception):
+    """Raised when the review API answers with a web page (WAF block) instead of JSON."""
+
+
+DATE_PATTERN = re.compile(r"^\d{4}\.\d{2}\.\d{2}$")
+# How a crawl stopped (iter_review_pages sets .stopped): only these mean every review up to the watermark /
+# the real last page was collected -- 'max_pages' (or an exception) leaves the rest of the list unread
+COMPLETE_STOPS = ('end', 'watermark')
+
+
+def reached_watermark(review, watermark):
+    """True once we hit the last review collected before -- or anything older than it
+    (covers the case where that exact review was deleted in the meantime).
+    watermark: (review_key, date) from WatermarkStore."""
+    if watermark is None:
+        return False
+    if review_key(review['Writer'], review['Date'], review['Content']) == watermark[0]:
+        return True
+    mark_date = watermark[1]
+    return bool(DATE_PATTERN.match(review['Date']) and DATE_PATTERN.match(mark_date)
+                and review['Date'] < mark_date)
+
+
+def build_session(user_agent=None, cookies=(), pool_size=10, cache=None):
+    """Pooled requests.Session carrying the API headers (and optionally a browser's UA + cookies).
+    cache: http_cache.ResponseCache -> GETs are answered from disk while fresh (session.response_cache)."""
+    session = requests.Session()
+    if cache is not None:
+        from http_cache import CachingAdapter
+        adapter = CachingAdapter(cache, pool_connections=pool_size, pool_maxsize=pool_size)
+    else:
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.response_cache = cache
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(API_HEADERS)
+    if user_agent:
+        session.headers['User-Agent'] = user_agent
+    for cookie in cookies:
+        session.cookies.set(cookie['name'], cookie['value'],
+                            domain=cookie.get('domain', ''), path=cookie.get('path', '/'))
+    return session
+
+
+class KyoboReviewAPI:
+    """[Collector Engine] Direct /api/review/list client (100 reviews per call instead of 10 per click)"""
+
+    def __init__(self, base_url=KYOBO_HOST, session=None, page_limit=100, delay=0.0, timeout=10,
+                 bootstrap=None, max_rebootstraps=3, profiler=None):
+        self.base_url = base_url.rstrip("/")
+        self.session = session if session is not None else build_session()
+        self.page_limit = page_limit
+        self.delay = delay
+        self.timeout = timeout
+        self.total_count = None
+        self._prefetched = {}
+        # [Hybrid] Callable returning a fresh cookie-carrying session when the WAF starts blocking
+        self.bootstrap = bootstrap
+        self.max_rebootstraps = max_rebootstraps
+        self.rebootstraps = 0
+        self.dedup = StreamingDeduper()
+        # 'end' / 'watermark' / 'max_pages' once iter_review_pages returns (see COMPLETE_STOPS)
+        self.stopped = None
+        # [HTTP Cache] Whether the last page came from the on-disk cache (no courtesy delay after those)
+        self.last_from_cache = False
+        # [HTTP Cache] True in delta mode: never replay a fresh entry, ask the server (ETag) -- a cached page 1
+        # / ledger count would hide every review posted since it was stored
+        self.revalidate = False
+        # [Profile] Per-page request / delay / parse timings (PalantirIntegrator passes its own profiler)
+        self.profiler = profiler if profiler is not None else PipelineProfiler()
+
+    def fetch_page(self, book_id, page, sort='001'):
+        """Fetch one page of the review list and return the raw 'data' block."""
+        try:
+            return self._request_page(book_id, page, sort)
+        except BlockedResponseError:
+            if self.bootstrap is None or self.rebootstraps >= self.max_rebootstraps:
+                raise
+            self.rebootstraps += 1
+            print(f"   🔄 [Hybrid] Blocked response on page {page} -> re-bootstrapping session "
+                  f"({self.rebootstraps}/{self.max_rebootstraps})...")
+            self.session = self.bootstrap()
+            return self._request_page(book_id, page, sort)
+
+    def _request_page(self, book_id, page, sort):
+        params = {
+            'page': page,
+            'pageLimit': self.page_limit,
+            'reviewSort': sort,
+            'revType': 'buy',
+            'saleCmdtid': book_id
+        }
+        headers = {'Cache-Control': 'no-cache'} if self.revalidate else None
+        response = self.session.get(f"{self.base_url}/api/review/list", params=params, headers=headers,
+                                    timeout=self.timeout)
+        self.last_from_cache = getattr(response, 'from_cache', False) and not response.revalidated
+
+        # If the body starts with '<html...', the request was blocked (see v1 debugging notes)
+        if response.text.lstrip().startswith('<'):
+            self._forget(response)
+            raise BlockedResponseError(f"HTML instead of JSON on page {page}: {response.text[:100]}")
+        try:
+            payload = response.json()
+        except ValueError:
+            self._forget(response)
+            raise BlockedResponseError(f"Non-JSON response on page {page}: {response.text[:100]}")
+
+        data = payload.get('data') or {}
+        if data.get('totalCount') is not None:
+            self.total_count = int(data['totalCount'])
+        return data
+
+    def _forget(self, response):
+        """A WAF block page must not be replayed from the HTTP cache on the next run."""
+        cache = getattr(self.session, 'response_cache', None)
+        if cache is not None:
+            from http_cache import cache_key
+            cache.evict(cache_key("GET", response.url))
+
+    @staticmethod
+    def parse_review(review, page):
+        """Map one API review object onto the Selenium DataFrame schema (dotted dates). Rating / Likes keep
+        the JSON numbers instead of round-tripping through str (ReviewBatch would only parse them back)."""
+        return {
+            'Page': page,
+            'Writer': review.get('mmbrId') or "Anonymous",
+            'Date': (review.get('createdDate') or "Unknown")[:10].replace("-", "."),
+            'Rating': review.get('revwRating', 0),
+            'Likes': review.get('recmCnt', 0),
+            'Content': (review.get('revwCntn') or "No Content").replace("\n", " ").strip()
+        }
+
+    def get_claimed_count(self, book_id):
+        """[Ledger] Read the total review count from the API envelope (one tiny request)."""
+        if self.total_count is None:
+            # Keep page 1 so scrape_reviews does not request it twice
+            self._prefetched[(book_id, 1, '001')] = self.fetch_page(book_id, 1)
+        return self.total_count or 0
+
+    def iter_review_pages(self, book_id, max_pages=50, sort='001', watermark=None, start_page=1, fingerprint=None,
+                          dedup=None):
+        """[Streaming] Yield each page's parsed rows as soon as it arrives (nothing is accumulated here).
+
+        watermark: identity from WatermarkStore -> delta mode, stop at the last review already collected.
+        start_page / fingerprint: resume from a checkpoint -- jump straight to start_page (the API takes the
+        page number), after re-reading the last checkpointed page once to see whether the list shifted.
+        dedup: StreamingDeduper (e.g. seeded with checkpointed rows); yielded pages never repeat a review.
+        A blocked page raises BlockedResponseError: the list is not exhausted, so checkpoints / watermarks stay.
+        """
+        print(f"\n📥 [Step 3] Data Extraction (API, {self.page_limit} per call)...")
+        self.dedup = dedup if dedup is not None else StreamingDeduper()
+        self.stopped = 'max_pages'
+        if start_page > 1:
+            print(f"   ⏩ [Resume] Jumping straight to API page {start_page}.")
+            if fingerprint:
+                self.verify_page(book_id, start_page - 1, sort, fingerprint)
+
+        waited = 0.0
+        for page in range(start_page, max_pages + 1):
+            started = time.perf_counter()
+            data = self._prefetched.pop((book_id, page, sort), None) or self.fetch_page(book_id, page, sort)
+
+            reviews = data.get('reviewList') or []
+            if not reviews:
+                print("   >> No more reviews available.")
+                self.stopped = 'end'
+                break
+
+            print(f"   - Collecting API Page {page} ({len(reviews)} items)...")
+            fetched = time.perf_counter()
+            rows, status = self.dedup.check([self.parse_review(review, page) for review in reviews])
+            if status == 'repeat':
+                print(f"   🛑 [Stop] API page {page} only repeats reviews already collected.")
+                self.stopped = 'end'
+                break
+            if status == 'overlap':
+                print(f"   ♻️ [Dedup] API page {page}: {len(reviews) - len(rows)} already collected reviews dropped.")
+            reached = False
+            page_rows = []
+            for row in rows:
+                if reached_watermark(row, watermark):
+                    reached = True
+                    break
+                page_rows.append(row)
+            self.profiler.page(page, page_rows, navigate=fetched - started, wait=waited,
+                               parse=time.perf_counter() - fetched, source="cache" if self.last_from_cache else "api")
+            yield page_rows
+            if reached:
+                print(f"   🛑 [Delta] Reached last run's watermark on API page {page}.")
+                self.stopped = 'watermark'
+                break
+
+            # Short page or ledger exhausted -> this was the last page
+            if len(reviews) < self.page_limit or (self.total_count is not None
+                                                  and page * self.page_limit >= self.total_count):
+                self.stopped = 'end'
+                break
+            # Courtesy delay only protects the server -- a page replayed from the cache never reached it
+            waited = self.delay if self.delay and not self.last_from_cache else 0.0
+            if waited:
+                time.sleep(waited)
+
+    def verify_page(self, book_id, page, sort, fingerprint):
+        """True when `page` still holds the reviews it held at checkpoint time."""
+        try:
+            data = self._prefetched.pop((book_id, page, sort), None) or self.fetch_page(book_id, page, sort)
+        except BlockedResponseError as e:
+            print(f"   !! [Resume] Could not re-check page {page}: {e}")
+            return False
+        reviews = data.get('reviewList') or []
+        if page_fingerprint([self.parse_review(review, page) for review in reviews]) == fingerprint:
+            return True
+        print(f"   ⚠️ [Resume] Page {page} changed since the checkpoint (reviews added/deleted); "
+              f"reviews collected twice are dropped as they arrive.")
+        return False
+
+    def scrape_reviews(self, book_id, max_pages=50, sort='001', watermark=None, on_page=None, start_page=1,
+                       fingerprint=None, batch=None):
+        """Collect every page into one DataFrame (typed columns, see records.ReviewBatch).
+        on_page: called with each page's parsed rows as soon as they exist (e.g. ReviewStore upsert).
+        batch: rows restored from a checkpoint (see checkpoint.py); the resumed pages are appended to it.
+        Rows are de-duplicated while they stream in (see fingerprints.StreamingDeduper)."""
+        batch = batch if batch is not None else ReviewBatch()
+        dedup = StreamingDeduper(batch)
+        for page_rows in self.iter_review_pages(book_id, max_pages, sort, watermark, start_page, fingerprint,
+                                                dedup):
+            batch.extend(page_rows)
+            if on_page is not None:
+                on_page(page_rows)
+        return batch.to_frame()  # only DataFrame callers pay for pandas (the audit / CLI paths do not)
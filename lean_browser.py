@@ -0,0 +1,99 @@
+import time
+
+from browser_pool import chrome_options, launch_chrome
+
+# Request patterns blocked in lean mode (Network.setBlockedURLs wildcards). First-party scripts are
+# left alone: the review widget and its pagination are rendered by Kyobo's own JS.
+BLOCKED_URL_PATTERNS = [
+    # images / fonts / media
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3",
+    # analytics / tag managers / ads
+    "*google-analytics.com*", "*googletagmanager.com*", "*googlesyndication.com*", "*doubleclick.net*",
+    "*googleadservices.com*", "*facebook.net*", "*connect.facebook.com*", "*analytics.tiktok.com*",
+    "*criteo.com*", "*criteo.net*", "*adnxs.com*", "*mobon.net*", "*dable.io*", "*wcs.naver.net*",
+    "*hotjar.com*", "*clarity.ms*", "*scorecardresearch.com*", "*appsflyer.com*", "*braze.com*",
+]
+
+# Navigation + Resource Timing: bytes over the wire and load time of the current document
+PAGE_WEIGHT_JS = """
+var nav = performance.getEntriesByType('navigation')[0] || {};
+var entries = performance.getEntriesByType('resource');
+var size = function (e) { return e.transferSize || e.encodedBodySize || 0; };
+var bytes = size(nav), opaque = 0;
+for (var i = 0; i < entries.length; i++) {
+    bytes += size(entries[i]);
+    if (!size(entries[i])) opaque++;
+}
+return {bytes: bytes, requests: entries.length + 1, opaque: opaque,
+        dom_ready_ms: Math.round(nav.domContentLoadedEventEnd || 0), load_ms: Math.round(nav.loadEventEnd || 0)};
+"""
+
+
+def lean_chrome_options():
+    """Headless Chrome without images (blink setting + content pref); the rest is blocked via DevTools."""
+    options = chrome_options(headless=True)
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--mute-audio")
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    return options
+
+
+def enable_blocking(driver, patterns=BLOCKED_URL_PATTERNS):
+    """Turn on DevTools request blocking for this browser (kept for every later navigation)."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+    return driver
+
+
+def launch_lean_chrome():
+    return enable_blocking(launch_chrome(options=lean_chrome_options()))
+
+
+def page_weight(driver):
+    """Bytes / requests / load time of the loaded page. Cross-origin resources without
+    Timing-Allow-Origin report 0 bytes and are counted under 'opaque'."""
+    try:
+        return driver.execute_script(PAGE_WEIGHT_JS)
+    except Exception:
+        return None
+
+
+def compare_page_load(url, wait_selector=".comment_item", timeout=20):
+    """[Lean Browser] Load `url` with blocking off and on; bytes, requests and time until reviews appear."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    results = {}
+    for mode, launch in (("full", lambda: launch_chrome(options=chrome_options(headless=True))),
+                         ("lean", launch_lean_chrome)):
+        driver = launch()
+        try:
+            started = time.perf_counter()
+            driver.get(url)
+            # Same lazy-load nudge as open_review_section
+            WebDriverWait(driver, timeout, poll_frequency=0.25).until(
+                lambda d: d.execute_script("window.scrollBy(0, 800);") or
+                EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector))(d))
+            weight = page_weight(driver) or {}
+            weight['reviews_visible_s'] = round(time.perf_counter() - started, 2)
+            results[mode] = weight
+        finally:
+            driver.quit()
+
+    for mode, weight in results.items():
+        print(f"   📦 [{mode:>4}] {weight.get('bytes', 0) / 1024:8.0f} KB in {weight.get('requests', 0):4} requests, "
+              f"load {weight.get('load_ms', 0)} ms, reviews visible after {weight['reviews_visible_s']}s")
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Page weight and load time with request blocking off vs on.")
+    parser.add_argument("book_id")
+    parser.add_argument("--base-url", default="https://product.kyobobook.co.kr")
+    args = parser.parse_args()
+    compare_page_load(f"{args.base_url.rstrip('/')}/detail/{args.book_id}")
@@ -1,77 +1,228 @@
-import pandas as pd
 import time
-import re
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+import os
+import json
+import threading
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import TimeoutException
 import openpyxl
 from openpyxl.styles import PatternFill
+from review_store import ReviewStore
+from report_writer import HIGHLIGHT_KEYWORDS, write_report
+from keyword_tagger import DEFAULT_LEXICON_PATH, KeywordTagger
+from extractors import EXTRACTION_MODES, extract_reviews, probe_ledger, resolve_backend
+from profiling import PipelineProfiler
+from records import ReviewBatch
+from checkpoint import ScrapeCheckpoint
+from kyobo_api import KYOBO_HOST, COMPLETE_STOPS, KyoboReviewAPI, build_session, reached_watermark
+from fingerprints import StreamingDeduper, page_fingerprint, review_key
+from browser_pool import chrome_options, launch_chrome
+from lean_browser import launch_lean_chrome, page_weight
+
+
+class WatermarkStore:
+    """[Delta] Remembers the newest review seen per book (JSON file, rewritten atomically)."""
+
+    # Batch workers each open their own store on the same file
+    _lock = threading.Lock()
+
+    def __init__(self, path="watermarks.json"):
+        self.path = path
+        self.marks = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def get(self, book_id):
+        """(review_key, date) of the newest review of the last complete run, or None."""
+        mark = self.marks.get(book_id)
+        return (mark['key'], mark['date']) if mark else None
+
+    def update(self, book_id, df):
+        """Record the first (newest, 'Latest' sort) row of this run as the new watermark."""
+        if not df.empty:
+            self.update_row(book_id, df.iloc[0])
+
+    def update_row(self, book_id, top):
+        with self._lock:
+            # Re-read so marks written by other workers since __init__ are kept
+            self.marks = self._load()
+            self.marks[book_id] = {
+                'key': review_key(top['Writer'], top['Date'], top['Content']),
+                'date': top['Date'],
+                'updated_at': time.strftime("%Y-%m-%d %H:%M:%S")
+            }
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.marks, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+
 
 class PalantirIntegrator:
-    def __init__(self):
+    ENGINES = ('selenium', 'api', 'hybrid')
+
+    def __init__(self, api_base_url=KYOBO_HOST, watermark_path="watermarks.json", store_path=None, parser="auto",
+                 extraction="html", lexicon_path=DEFAULT_LEXICON_PATH, browser_pool=None, headless=False,
+                 lean=False, columnar_root=None, checkpoint_dir=None, http_cache=None, near_dups=None):
         print("--- [System] Palantir Vertical Integrator (Final Fix) Operational ---")
-        options = webdriver.ChromeOptions()
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--window-size=1920,1080")
-        
-        self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-        self.wait = WebDriverWait(self.driver, 10)
+        if extraction not in EXTRACTION_MODES:
+            raise ValueError(f"Unknown extraction mode '{extraction}' (choose from {EXTRACTION_MODES})")
+        self.api_base_url = api_base_url
+        # [Parser] HTML backend for review fragments: 'auto' -> selectolax > lxml > bs4 (whatever is installed)
+        self.parser = resolve_backend(parser)
+        # [Extraction] 'html' = fragment + parser, 'js' = every field computed in-browser in one execute_script
+        self.extraction = extraction
+        self.extract_ms = []
+        # [Dedup] 64-bit review fingerprints of the current scrape (see fingerprints.StreamingDeduper)
+        self.dedup = StreamingDeduper()
+        self.stopped = None
+        # [Tagging] Lexicons compiled once into an Aho-Corasick automaton, reused for every report
+        self.tagger = KeywordTagger.from_config(lexicon_path)
+        self.watermark_path = watermark_path
+        # [Store] Optional SQLite review store: pages are upserted as they are parsed, reports are built from it
+        self.store = ReviewStore(store_path) if store_path else None
+        # [Columnar] Optional Parquet dataset root: every report is also appended there, typed and partitioned
+        self.columnar_root = columnar_root
+        # [Checkpoint] Optional directory: progress is committed after every page so a crashed run can resume
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint = None
+        # [HTTP Cache] Optional http_cache.ResponseCache for the requests-based engines (api / hybrid)
+        self.http_cache = http_cache
+        # [Near-Dup] Optional near_duplicates.NearDuplicateIndex shared across books: every report is indexed
+        # and gets 'Near-Dup Cluster' / 'Near-Dup Books' columns (templated reviews copied across books)
+        self.near_dups = near_dups
+        # [Pool] Optional BrowserPool: a warm browser is borrowed on first use and handed back by close()
+        self.browser_pool = browser_pool
+        self.headless = headless
+        # [Lean] Headless + DevTools blocking of images, fonts, media and analytics/ad domains
+        self.lean = lean
+        self.page_weight = None
+        self.ledger_probe = None
+        self._driver = None
+        self.wait = None
+        # [Waits] One entry per event-driven wait: how long it really took vs the old fixed sleep
+        self.wait_log = []
+        # [Profile] Step spans + per-page navigate/wait/parse timings of the current run
+        self.profiler = PipelineProfiler()
+
+    @property
+    def driver(self):
+        """Chrome is only launched (or borrowed from the pool) the first time a step actually needs it."""
+        if self._driver is None:
+            if self.browser_pool is not None:
+                self._driver = self.browser_pool.acquire()
+            elif self.lean:
+                self._driver = launch_lean_chrome()
+            else:
+                # chromedriver path is resolved once and cached on disk (see browser_pool.resolve_chromedriver)
+                self._driver = launch_chrome(options=chrome_options(self.headless))
+            self.wait = WebDriverWait(self._driver, 10)
+        return self._driver
+
+    def close(self, discard=False):
+        """Quit Chrome, or hand it back to the pool (discard=True: it is not trusted for another book)."""
+        if self._driver is not None:
+            if self.browser_pool is not None:
+                self.browser_pool.release(self._driver, discard=discard)
+            else:
+                print("👋 Closing Browser")
+                self._driver.quit()
+            self._driver = None
+            self.wait = None
+
+    # ==================================================================
+    # [Waits] Block only until the real condition holds (replaces fixed time.sleep)
+    # ==================================================================
+    def wait_for(self, step, condition, timeout=10, legacy=0.0, poll=0.1):
+        """Wait until `condition(driver)` is truthy; log the real duration next to the old fixed sleep."""
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=poll).until(condition)
+        except TimeoutException:
+            timed_out = True
+        waited = time.perf_counter() - started
+        self.wait_log.append({'step': step, 'seconds': round(waited, 3), 'legacy_seconds': legacy,
+                              'timed_out': timed_out})
+        return not timed_out
+
+    def report_extraction(self):
+        if not self.extract_ms:
+            return
+        mode = "in-browser js" if self.extraction == "js" else f"fragment + {self.parser}"
+        avg = sum(self.extract_ms) / len(self.extract_ms)
+        print(f"   ⏱️ [Extract] {mode}: {avg:.1f} ms/page avg over {len(self.extract_ms)} pages "
+              f"(max {max(self.extract_ms):.1f} ms)")
+
+    def report_page_weight(self):
+        """Bytes / requests / load time of the detail page (compare lean=True vs lean=False runs)."""
+        self.page_weight = page_weight(self.driver)
+        if not self.page_weight:
+            return
+        self.page_weight['lean'] = self.lean
+        self.profiler.meta['page_weight'] = self.page_weight
+        print(f"   📦 [Page] {self.page_weight['bytes'] / 1024:.0f} KB in {self.page_weight['requests']} requests, "
+              f"load {self.page_weight['load_ms']} ms (lean mode {'on' if self.lean else 'off'})")
+
+    def report_waits(self):
+        if not self.wait_log:
+            return
+        waited = sum(w['seconds'] for w in self.wait_log)
+        legacy = sum(w['legacy_seconds'] for w in self.wait_log)
+        timeouts = sum(w['timed_out'] for w in self.wait_log)
+        print(f"   ⏱️ [Waits] {len(self.wait_log)} waits took {waited:.1f}s "
+              f"(fixed sleeps would have taken {legacy:.1f}s, saved {legacy - waited:.1f}s, {timeouts} timeouts)")
+
+    @staticmethod
+    def _first_review_changed(previous, previous_text=None):
+        """Condition: the first .comment_item we saw has been replaced (stale) and a new list is present --
+        or, for a widget that updates the list nodes in place, that same node now shows another review."""
+        def condition(driver):
+            try:
+                # .text raises StaleElementReferenceException once re-rendered
+                return previous_text is not None and previous.text != previous_text
+            except Exception:
+                return len(driver.find_elements(By.CSS_SELECTOR, ".comment_item")) > 0
+        return condition
+
+    def _first_review(self):
+        items = self.driver.find_elements(By.CSS_SELECTOR, ".comment_item")
+        return items[0] if items else None
 
     # ==================================================================
     # [Refined] Enhanced Ledger Audit (Search for All/Review/Klover keywords)
     # ==================================================================
     def get_claimed_count(self):
+        """All ledger strategies (keyword "(N)" tabs, then .count) evaluated in-page in one execute_script."""
         print("\n📘 [Step 1] Total Count Audit (Ledger Verification)...")
-        claimed_count = 0
-        
-        # Keywords to search for count display
-        keywords = ['리뷰', '전체', 'Klover', 'Review']
-        
         try:
-            # 1. Search for elements matching "Keyword + (Number)" pattern on screen
-            for keyword in keywords:
-                # XPATH: Search for elements containing both the keyword and the bracket '('
-                xpath = f"//*[contains(text(), '{keyword}') and contains(text(), '(')]"
-                elements = self.driver.find_elements(By.XPATH, xpath)
-                
-                for elem in elements:
-                    # Trust only displayed elements
-                    if elem.is_displayed():
-                        text = elem.text.strip()
-                        # Regex: Extract numbers within brackets
-                        match = re.search(r'\((\d+)\)', text)
-                        if match:
-                            claimed_count = int(match.group(1))
-                            print(f"   >> [Success] Found count in '{keyword}' tab: {claimed_count}")
-                            return claimed_count
-
-            # 2. Fallback: Directly target elements with the 'count' class
-            if claimed_count == 0:
-                count_elems = self.driver.find_elements(By.CSS_SELECTOR, ".count")
-                for elem in count_elems:
-                    # Adopt if it contains numbers and the element is displayed
-                    if elem.is_displayed() and elem.text.isdigit():
-                        print(f"   >> [Support] Found count in .count class: {elem.text}")
-                        return int(elem.text)
-
-            print("   >> [Fail] Could not determine ledger count. (Proceeding with 0)")
-            return 0
-            
+            probe = probe_ledger(self.driver)
         except Exception as e:
             print(f"   >> [Error] Issue occurred during ledger audit: {e}")
             return 0
 
+        self.ledger_probe = probe
+        self.profiler.meta['ledger_probe'] = probe
+        strategy = probe.get('strategy')
+        if strategy and strategy.startswith('keyword:'):
+            print(f"   >> [Success] Found count in '{strategy.split(':', 1)[1]}' tab: {probe['count']}")
+        elif strategy:
+            print(f"   >> [Support] Found count in .count class: {probe['count']}")
+        else:
+            print("   >> [Fail] Could not determine ledger count. (Proceeding with 0)")
+        print(f"   ⏱️ [Ledger] Probe took {probe['ms']:.1f} ms ({probe['checked']} candidates, 1 round trip)")
+        return probe['count']
+
     def apply_sort(self):
         """[Scout Function] Force click the 'Latest' sort button"""
         print("\n⚙️ [Step 2] Applying 'Latest' Sort (Sorting)...")
         try:
+            first = self._first_review()
+            first_text = first.text if first is not None else None
             # Priority 1: Click Label
             try:
                 target = self.driver.find_element(By.XPATH, "//label[contains(text(), '최신')]")
@@ -82,119 +233,455 @@ class PalantirIntegrator:
                 target = self.driver.find_element(By.CSS_SELECTOR, "input[value='001']")
                 self.driver.execute_script("arguments[0].click();", target)
                 print("   >> [Success] Found and clicked Radio Button.")
-            
-            time.sleep(3) # Wait for loading
+
+            # Wait for the list to re-render; if it was already 'Latest' nothing changes,
+            # so the timeout equals the old fixed sleep (never slower than before)
+            if first is not None:
+                self.wait_for("sort re-render", self._first_review_changed(first, first_text), timeout=3, legacy=3)
         except:
             print("   >> [Warning] Sorting button not found. (Proceeding with default order)")
 
-    def scrape_reviews(self, max_pages):
-        """[Collector Function] Data Extraction"""
+    def iter_review_pages(self, max_pages, watermark=None, start_page=1, fingerprint=None, dedup=None):
+        """[Streaming] Yield each page's rows right after parsing; the next click happens only after the
+        consumer has handled them (watermark given -> delta mode, stop at last run's newest review)
+        start_page / fingerprint: resume from a checkpoint (see fast_forward).
+        dedup: StreamingDeduper -- reviews already collected are dropped at once, a repeated page stops the loop.
+        self.stopped tells how it ended: 'end' / 'watermark' / 'max_pages' (see kyobo_api.COMPLETE_STOPS)."""
         print("\n📥 [Step 3] Data Extraction (Scraping)...")
-        all_reviews = []
-        last_first_content = ""
+        self.extract_ms = []
+        self.dedup = dedup if dedup is not None else StreamingDeduper()
+        self.stopped = 'max_pages'
+        reached = False
+        navigated = waited = 0.0  # what it took to reach the current page (page 1 was opened in Step 1)
+        pages = range(start_page, max_pages + 1)
+        if start_page > 1 and not self.fast_forward(start_page, fingerprint):
+            self.stopped = 'end'
+            pages = ()
 
-        for page in range(1, max_pages + 1):
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            items = soup.select(".comment_item")
+        for page in pages:
+            # Only the .comment_list outerHTML (or, in 'js' mode, a compact field array) crosses the WebDriver wire
+            started = time.perf_counter()
+            rows = extract_reviews(self.driver, page, self.extraction, self.parser)
+            parsed = time.perf_counter() - started
+            self.extract_ms.append(parsed * 1000)
+            self.profiler.page(page, rows, navigate=navigated, wait=waited, parse=parsed)
             
-            if not items:
+            if not rows:
                 print("   >> No more reviews available.")
+                self.stopped = 'end'
                 break
 
-            # Prevent Duplicate Page Loading
-            try:
-                current_first = items[0].select_one(".comment_text").get_text(strip=True)
-                if current_first == last_first_content:
-                    print(f"   🛑 [Stop] Content on page {page} is identical to the previous page.")
+            # Prevent Duplicate Page Loading: 64-bit fingerprints of every review collected so far
+            total = len(rows)
+            rows, status = self.dedup.check(rows)
+            if status == 'repeat':
+                print(f"   🛑 [Stop] Page {page} only repeats reviews already collected.")
+                self.stopped = 'end'
+                break
+            if status == 'overlap':
+                print(f"   ♻️ [Dedup] Page {page}: {total - len(rows)} already collected reviews dropped.")
+
+            print(f"   - Collecting Page {page} ({len(rows)} items)...")
+
+            page_rows = []
+            for review in rows:
+                if reached_watermark(review, watermark):
+                    reached = True
                     break
-                last_first_content = current_first
-            except: pass
-
-            print(f"   - Collecting Page {page} ({len(items)} items)...")
-
-            for item in items:
-                try:
-                    try: content = item.select_one(".comment_text").get_text(" ", strip=True)
-                    except: content = "No Content"
-                    
-                    try: rating = item.select_one(".rating-input")['value']
-                    except: rating = "0"
-                    
-                    try: 
-                        info = item.select(".user_info_box .info_item")
-                        writer = info[0].text.strip() if len(info) > 0 else "Anonymous"
-                        date = info[1].text.strip() if len(info) > 1 else "Unknown"
-                    except: writer="Anonymous"; date="Unknown"
-                    
-                    try: likes = item.select_one(".btn_like .text").text.strip()
-                    except: likes = "0"
-
-                    all_reviews.append({
-                        'Page': page,
-                        'Writer': writer,
-                        'Date': date,
-                        'Rating': rating,
-                        'Likes': likes,
-                        'Content': content
-                    })
-                except: continue
+                page_rows.append(review)
+
+            yield page_rows
+            if reached:
+                print(f"   🛑 [Delta] Reached last run's watermark on page {page}.")
+                self.stopped = 'watermark'
+                break
 
             # Page Navigation
-            try:
-                next_btns = self.driver.find_elements(By.CSS_SELECTOR, "button.btn_page.next")
-                if next_btns:
-                    btn = next_btns[0]
-                    if "disabled" in btn.get_attribute("class"):
-                        break
-                    self.driver.execute_script("arguments[0].click();", btn)
-                    time.sleep(2.5)
-                else: break
-            except: break
-
-        return pd.DataFrame(all_reviews)
-
-    def execute_pipeline(self, book_id, output_file="Integrated_Result.xlsx"):
+            step = self.next_page(page)
+            if step is None:
+                self.stopped = 'end'
+                break
+            navigated, waited = step
+
+        self.report_waits()
+        self.report_extraction()
+
+    def next_page(self, page):
+        """Click 'next' and wait for page + 1 to render -> (navigate, wait) seconds; None on the last page
+        (no 'next' button, or it is disabled). Any other failure -- a stale button, a click that throws --
+        raises: taking it for the end of the list would save a partial crawl as 'ok' and drop its checkpoint."""
+        started = time.perf_counter()
+        next_btns = self.driver.find_elements(By.CSS_SELECTOR, "button.btn_page.next")
+        if not next_btns:
+            return None
+        btn = next_btns[0]
+        if "disabled" in (btn.get_attribute("class") or ""):
+            return None
+        first = self._first_review()
+        first_text = first.text if first is not None else None
+        self.driver.execute_script("arguments[0].click();", btn)
+        clicked = time.perf_counter()
+        if first is not None:
+            # Capped at the old fixed sleep: a render the condition cannot see never costs more than before
+            # (a page that did not change is caught as a 'repeat' by the deduper)
+            self.wait_for(f"page {page + 1} render", self._first_review_changed(first, first_text), timeout=2.5,
+                          legacy=2.5)
+        else:
+            time.sleep(2.5)
+        return clicked - started, time.perf_counter() - clicked
+
+    def fast_forward(self, start_page, fingerprint=None):
+        """[Resume] Click through to `start_page` without parsing the pages in between (the widget has no
+        page URL to jump to). Only the last checkpointed page is parsed once, to compare its fingerprint."""
+        print(f"   ⏩ [Resume] Fast-forwarding to page {start_page} (no parsing)...")
+        started = time.perf_counter()
+        for page in range(1, start_page):
+            if page == start_page - 1 and fingerprint:
+                rows = extract_reviews(self.driver, page, self.extraction, self.parser)
+                if page_fingerprint(rows) != fingerprint:
+                    print(f"   ⚠️ [Resume] Page {page} changed since the checkpoint (reviews added/deleted); "
+                          f"reviews collected twice are dropped as they arrive.")
+            if self.next_page(page) is None:
+                print(f"   >> [Resume] The list ends at page {page}. (Nothing left to collect)")
+                return False
+        print(f"   >> [Resume] Reached page {start_page} in {time.perf_counter() - started:.1f}s.")
+        return True
+
+    def scrape_reviews(self, max_pages, watermark=None, on_page=None, start_page=1, fingerprint=None, batch=None):
+        """[Collector Function] Data Extraction
+
+        on_page is called with each page's rows right after parsing (e.g. ReviewStore upsert).
+        batch: rows restored from a checkpoint; the resumed pages are appended to it.
+        Rows are de-duplicated while they stream in (see fingerprints.StreamingDeduper).
+        """
+        batch = batch if batch is not None else ReviewBatch()
+        dedup = StreamingDeduper(batch)
+        for page_rows in self.iter_review_pages(max_pages, watermark, start_page, fingerprint, dedup):
+            batch.extend(page_rows)
+            if on_page is not None:
+                on_page(page_rows)
+        return batch.to_frame()
+
+    def execute_pipeline(self, book_id, output_file="Integrated_Result.xlsx", engine="selenium", max_pages=50,
+                         keep_browser=False, delta=False, profile=None, profile_dumps=(), resume=False):
+        """Run the 4 steps for one book and return a result row (used by batch mode for the summary).
+
+        keep_browser=True leaves Chrome running so a batch worker can reuse it for the next ID.
+        delta=True only collects reviews newer than the watermark saved by the previous delta run.
+        resume=True continues an interrupted run from its checkpoint (needs checkpoint_dir).
+        profile='run.json' writes the step spans / per-page timings there; profile_dumps=('cprofile',
+        'tracemalloc') also writes run.prof / run.tracemalloc.txt next to it.
+        """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine '{engine}' (choose from {self.ENGINES})")
+        result = {'book_id': book_id, 'engine': engine, 'output_file': output_file,
+                  'claimed': 0, 'collected': 0, 'status': 'ok', 'error': '', 'seconds': 0.0}
+        self.profiler.start(profile_dumps if profile else (), book_id=book_id, engine=engine, max_pages=max_pages,
+                            delta=delta, parser=self.parser, extraction=self.extraction)
+        started = time.perf_counter()
+        self.checkpoint = None
+        self.dedup = StreamingDeduper()
         try:
-            url = f"https://product.kyobobook.co.kr/detail/{book_id}"
-            print(f"🚀 [Start] Connection URL: {url}")
-            self.driver.get(url)
-            time.sleep(3)
-
-            # Induce loading (Scroll down further)
-            print("   (Waiting for page to load...)")
-            for _ in range(5):
-                self.driver.execute_script("window.scrollTo(0, window.scrollY + 800);")
-                time.sleep(0.5)
-
-            # 1. Audit Ledger
-            claimed_count = self.get_claimed_count()
-            
-            # 2. Apply Sorting
-            self.apply_sort()
-            
-            # 3. Extract Data
-            df = self.scrape_reviews(max_pages=50)
-            
-            # 4. Validate and Save
-            self.finalize_report(df, claimed_count, output_file)
+            if engine in ("api", "hybrid"):
+                claimed_count, collected_count = self.run_api_engine(book_id, output_file, max_pages,
+                                                                     hybrid=(engine == "hybrid"), delta=delta,
+                                                                     resume=resume)
+            else:
+                claimed_count, collected_count = self.run_selenium_engine(book_id, output_file, max_pages,
+                                                                          delta=delta, resume=resume)
+            result.update(claimed=claimed_count, collected=collected_count)
+            if self.checkpoint is not None and self.checkpoint.state['done']:
+                self.checkpoint.clear()
+            elif self.checkpoint is not None and self.checkpoint.state['last_page']:
+                print(f"   💾 [Checkpoint] Stopped at max_pages; {self.checkpoint.state['rows']} reviews kept. "
+                      f"(Re-run with resume to continue from page {self.checkpoint.next_page})")
 
         except Exception as e:
             print(f"❌ Error occurred: {e}")
+            result.update(status='error', error=str(e))
+            if self.checkpoint is not None and self.checkpoint.state['last_page']:
+                state = self.checkpoint.state
+                follow_up = ("rebuild the report without scraping" if state['done']
+                             else f"continue from page {self.checkpoint.next_page}")
+                print(f"   💾 [Checkpoint] {state['rows']} reviews through page {state['last_page']} are saved. "
+                      f"(Re-run with resume to {follow_up})")
+            # A driver that failed mid-run is not trusted for the next book
+            self.close(discard=True)
+        finally:
+            if not keep_browser:
+                self.close()
+        result['seconds'] = round(time.perf_counter() - started, 2)
+
+        self.profiler.stop()
+        self.profiler.meta.update(status=result['status'], claimed=result['claimed'],
+                                  collected=result['collected'], seconds=result['seconds'])
+        if profile:
+            self.profiler.summary()
+            self.profiler.dump(profile, waits=self.wait_log)
+        return result
+
+    def collect_with_watermark(self, book_id, delta, scrape, collector, source='api', resume=False):
+        """Run `scrape(watermark=, on_page=, ...)`; in delta mode load the watermark first and move it forward after.
+        collector: the object whose iter_review_pages ran (its .stopped says whether the list was exhausted).
+
+        With a review store attached, every page is upserted as it arrives and the returned
+        DataFrame is the book's full stored history (so delta runs still produce a complete report).
+        With checkpoint_dir set, every page is also committed to a ScrapeCheckpoint, and resume=True
+        continues after the last committed page with the rows collected before the crash.
+        """
+        on_page = None
+        if self.store is not None:
+            new_rows = []
+            on_page = lambda rows: new_rows.append(self.store.upsert(book_id, rows))
+
+        restored = self.open_checkpoint(book_id, source, resume)
+        checkpoint = self.checkpoint
+        if checkpoint is not None:
+            upsert = on_page
+
+            def on_page(rows):
+                if upsert is not None:
+                    upsert(rows)
+                if rows:
+                    checkpoint.save_page(rows[0]['Page'], rows, collector.dedup.last_fingerprint)
+
+        watermark = None
+        if delta:
+            marks = WatermarkStore(self.watermark_path)
+            watermark = marks.get(book_id)
+            if watermark is None:
+                print("   >> [Delta] No watermark yet for this book. (Full crawl this time)")
+        if restored is not None and checkpoint.state['done']:
+            df = restored.to_frame()
+            complete = True
+        else:
+            if restored is not None:
+                df = scrape(watermark=watermark, on_page=on_page, start_page=checkpoint.next_page,
+                            fingerprint=checkpoint.state['fingerprint'], batch=restored)
+            else:
+                df = scrape(watermark=watermark, on_page=on_page)
+            complete = collector.stopped in COMPLETE_STOPS
+        # Stopped at max_pages: the checkpoint stays open so resume continues with the next page
+        if checkpoint is not None and complete:
+            checkpoint.finish()
+        if delta and complete:
+            marks.update(book_id, df)
+        elif delta:
+            # Moving it now would make the next delta run stop above the reviews this run never reached
+            print("   >> [Delta] Crawl stopped before the old watermark / last page. (Watermark not moved)")
+
+        if self.store is None:
+            return df
+        print(f"   💾 [Store] {sum(new_rows)} new reviews upserted, {self.store.count(book_id)} stored for {book_id}")
+        return self.store.load(book_id)
+
+    def open_checkpoint(self, book_id, source, resume=False):
+        """Start this run's ScrapeCheckpoint (no-op without checkpoint_dir).
+        resume=True -> ReviewBatch of the rows committed by the interrupted run, or None if there is none."""
+        self.checkpoint = None
+        if not self.checkpoint_dir:
+            if resume:
+                print("   >> [Resume] No checkpoint directory configured. (Starting from page 1)")
+            return None
+        self.checkpoint = ScrapeCheckpoint(self.checkpoint_dir, book_id, source=source)
+        rows = self.checkpoint.load() if resume else None
+        if rows is None:
+            if resume:
+                print("   >> [Resume] No checkpoint for this book. (Starting from page 1)")
+            self.checkpoint.reset()
+            return None
+        state = self.checkpoint.state
+        print(f"   ♻️ [Resume] Checkpoint from {state['updated_at']}: {state['rows']} reviews through page "
+              f"{state['last_page']}" + (" (scrape already complete)" if state['done'] else ""))
+        return ReviewBatch(rows)
+
+    def run_selenium_engine(self, book_id, output_file, max_pages=50, delta=False, resume=False):
+        # Open the page, 1. Audit Ledger, 2. Apply Sorting
+        claimed_count = self.open_review_section(book_id)
+
+        # 3. Extract Data
+        with self.profiler.span("Step 3 extraction"):
+            df = self.collect_with_watermark(book_id, delta,
+                                             lambda **kwargs: self.scrape_reviews(max_pages=max_pages, **kwargs),
+                                             self, source='selenium', resume=resume)
+        self.profiler.count('duplicates_dropped', self.dedup.dropped)
+
+        # 4. Validate and Save
+        with self.profiler.span("Step 4 report"):
+            collected_count = self.finalize_report(df, claimed_count, output_file, delta=delta and self.store is None,
+                                                   book_id=book_id, deduplicated=True)
+        return claimed_count, collected_count
+
+    def open_review_section(self, book_id):
+        """Load the detail page, wait for the review list, audit the ledger and force 'Latest' sort."""
+        url = f"{self.api_base_url}/detail/{book_id}"
+        print(f"🚀 [Start] Connection URL: {url}")
+        self.wait_log = []
+        with self.profiler.span("open page"):
+            with self.profiler.span("navigate"):
+                self.driver.get(url)
+            with self.profiler.span("wait"):
+                self.wait_for("document ready",
+                              lambda d: d.execute_script("return document.readyState") == "complete", legacy=3)
+
+                # Induce loading: keep scrolling 800px per poll only until the first review exists
+                print("   (Waiting for page to load...)")
+                self.wait_for("review section",
+                              lambda d: d.execute_script("window.scrollBy(0, 800);"
+                                                         "return document.querySelector('.comment_item') !== null;"),
+                              timeout=15, legacy=2.5, poll=0.25)
+        self.report_page_weight()
+
+        # 1. Audit Ledger
+        with self.profiler.span("Step 1 ledger"):
+            claimed_count = self.get_claimed_count()
+
+        # 2. Apply Sorting
+        with self.profiler.span("Step 2 sort"):
+            self.apply_sort()
+        return claimed_count
+
+    def handoff_session(self, book_id):
+        """[Hybrid] Load the detail page once in Chrome, export cookies + UA to requests, then drop the browser."""
+        url = f"{self.api_base_url}/detail/{book_id}"
+        print(f"   🍪 [Hybrid] Bootstrapping cookies via Chrome: {url}")
+        self.driver.get(url)
+        self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+
+        user_agent = self.driver.execute_script("return navigator.userAgent;")
+        cookies = self.driver.get_cookies()
+        session = build_session(user_agent=user_agent, cookies=cookies, cache=self.http_cache)
+        print(f"   >> [Handoff] {len(cookies)} cookies exported. Browser no longer needed.")
+
+        # The whole point of the handoff: only one HTTP client stays alive
+        self.close()
+        return session
+
+    def run_api_engine(self, book_id, output_file, max_pages=50, hybrid=False, delta=False, resume=False):
+        """[API Engine] Same 4 steps, but every page comes straight from /api/review/list (no browser)."""
+        api, claimed_count = self.open_api(book_id, hybrid, delta)
+        with self.profiler.span("Step 3 extraction"):
+            df = self.collect_with_watermark(book_id, delta,
+                                             lambda **kwargs: api.scrape_reviews(book_id, max_pages=max_pages,
+                                                                                 **kwargs),
+                                             api, source='api', resume=resume)
+        self.profiler.count('duplicates_dropped', api.dedup.dropped)
+        if self.http_cache is not None:
+            self.profiler.meta['http_cache'] = self.http_cache.summary()
+        with self.profiler.span("Step 4 report"):
+            collected_count = self.finalize_report(df, claimed_count, output_file, delta=delta and self.store is None,
+                                                   book_id=book_id, deduplicated=True)
+        return claimed_count, collected_count
+
+    def open_api(self, book_id, hybrid=False, delta=False):
+        """API counterpart of open_review_section: build the client (hybrid -> browser cookies) and read the ledger.
+        delta=True: every request (the ledger page first) is revalidated instead of replayed from the HTTP cache."""
+        mode = "Hybrid Engine" if hybrid else "API Engine"
+        print(f"🚀 [Start] {mode}: {self.api_base_url}/api/review/list (saleCmdtid={book_id})")
+        with self.profiler.span("open page"):
+            if hybrid:
+                bootstrap = lambda: self.handoff_session(book_id)
+                api = KyoboReviewAPI(base_url=self.api_base_url, session=bootstrap(), bootstrap=bootstrap,
+                                     profiler=self.profiler)
+            else:
+                api = KyoboReviewAPI(base_url=self.api_base_url, session=build_session(cache=self.http_cache),
+                                     profiler=self.profiler)
+            api.revalidate = delta
+
+        print("\n📘 [Step 1] Total Count Audit (Ledger Verification)...")
+        with self.profiler.span("Step 1 ledger"):
+            claimed_count = api.get_claimed_count(book_id)
+        print(f"   >> [Success] Found count in API envelope: {claimed_count}")
+
+        with self.profiler.span("Step 2 sort"):
+            print("\n⚙️ [Step 2] Applying 'Latest' Sort (Sorting)...")
+            print("   >> [Success] reviewSort=001 sent with every request.")
+        return api, claimed_count
+
+    def stream_reviews(self, book_id, sinks, engine="api", max_pages=50, delta=False, keep_browser=False):
+        """[Streaming Mode] Push every page straight into `sinks` (see sinks.py) -- nothing is held in memory,
+        and whatever was collected before a crash is already on disk."""
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine '{engine}' (choose from {self.ENGINES})")
+        watermark = None
+        if delta:
+            marks = WatermarkStore(self.watermark_path)
+            watermark = marks.get(book_id)
+
+        streamed = 0
+        newest = None
+        try:
+            if engine in ("api", "hybrid"):
+                collector, claimed_count = self.open_api(book_id, hybrid=(engine == "hybrid"), delta=delta)
+                pages = collector.iter_review_pages(book_id, max_pages, watermark=watermark)
+            else:
+                collector, claimed_count = self, self.open_review_section(book_id)
+                pages = self.iter_review_pages(max_pages, watermark=watermark)
+
+            for page_rows in pages:
+                for sink in sinks:
+                    sink.write(book_id, page_rows)
+                if newest is None and page_rows:
+                    newest = page_rows[0]
+                streamed += len(page_rows)
+            complete = collector.stopped in COMPLETE_STOPS
         finally:
-            print("👋 Closing Browser")
-            self.driver.quit()
+            for sink in sinks:
+                sink.flush()
+            if not keep_browser:
+                self.close()
+
+        if delta and newest is not None and complete:
+            marks.update_row(book_id, newest)
+        elif delta and newest is not None:
+            print("   >> [Delta] Crawl stopped before the old watermark / last page. (Watermark not moved)")
+        print(f"\n📊 [Stream] {book_id}: {streamed} reviews streamed (ledger {claimed_count})")
+        return {'book_id': book_id, 'claimed': claimed_count, 'streamed': streamed}
 
-    def finalize_report(self, df, claimed_count, filename):
+    def finalize_report(self, df, claimed_count, filename, delta=False, book_id=None, deduplicated=False):
+        """deduplicated=True: the rows already went through a StreamingDeduper, skip the string comparison."""
         print("\n📊 [Step 4] Final Validation & Save (Report Generation)...")
         
         if df.empty:
-            print("   ⚠️ No data collected.")
-            return
+            print("   ✅ No new reviews since the last run." if delta else "   ⚠️ No data collected.")
+            return 0
 
-        # De-duplication
-        df = df.drop_duplicates(subset=['Writer', 'Date', 'Content'])
+        # De-duplication (rows loaded from the review store are already unique by (book_id, review_hash))
+        if self.store is None and not deduplicated:
+            with self.profiler.span("dedup"):
+                before = len(df)
+                df = df.drop_duplicates(subset=['Writer', 'Date', 'Content'])
+                self.profiler.count('duplicates_dropped', before - len(df))
         collected_count = len(df)
 
+        if self.columnar_root and book_id is not None:
+            import columnar  # pyarrow is optional and slow to import -- only loaded when a dataset is written
+            with self.profiler.span("parquet write"):
+                # crawl_date = first collected: the store knows it (first_seen) for its whole history,
+                # otherwise the rows are stamped today and write_dataset skips the ones stored on an earlier day
+                table = self.store.to_arrow(book_id) if self.store is not None else columnar.to_arrow(df, book_id)
+                columnar.export_table(table, self.columnar_root)
+
+        if self.near_dups is not None and book_id is not None:
+            with self.profiler.span("near-dup"):
+                self.near_dups.add_frame(df, book_id)
+                df = self.near_dups.annotate(df, book_id)
+                flagged = int((df['Near-Dup Cluster'] != "").sum())
+                self.profiler.count('near_duplicates', flagged)
+            if flagged:
+                print(f"   🧬 [Near-Dup] {flagged} reviews belong to near-duplicate clusters "
+                      f"({int((df['Near-Dup Books'] > 1).sum())} shared with other books)")
+
+        if delta:
+            # A delta run only holds the new reviews, so the ledger comparison does not apply
+            print("\n" + "="*40)
+            print(f"   [Delta Report]")
+            print(f"   1. Ledger count from site : {claimed_count}")
+            print(f"   2. New reviews this run   : {collected_count}")
+            print("="*40 + "\n")
+            self.write_tagged_report(df, filename)
+            return collected_count
+
         print("\n" + "="*40)
         print(f"   [Validation Report]")
         print(f"   1. Ledger count from site : {claimed_count}")
@@ -210,15 +697,23 @@ class PalantirIntegrator:
             print(f"   ❓ Verdict: Found {abs(diff)} more actual items than ledger")
         print("="*40 + "\n")
 
-        df.to_excel(filename, index=False)
-        self.highlight_excel(filename)
+        self.write_tagged_report(df, filename)
+        return collected_count
+
+    def write_tagged_report(self, df, filename):
+        """Tag every review once (per-lexicon columns), then write the sheet in a single streaming pass.
+        Rows are highlighted by a conditional-formatting rule on the 'Tags' column (no per-cell fills)."""
+        with self.profiler.span("tagging"):
+            df = self.tagger.tag_frame(df)
+        with self.profiler.span("excel write"):
+            write_report(df, filename, keywords=self.tagger.highlight, highlight_column='Tags')
 
     def highlight_excel(self, filename):
+        """[Legacy] Re-open an existing workbook and fill matching rows cell by cell (kept for old reports)."""
         wb = openpyxl.load_workbook(filename)
         ws = wb.active
         yellow_fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
-        # Keywords for highlighting (Targeting Korean review text)
-        keywords = ['번역', '직역', '문장', '오역', '가독성', '읽기']
+        keywords = HIGHLIGHT_KEYWORDS
         
         for row in ws.iter_rows(min_row=2):
             cell_text = str(row[5].value) # Content column index
@@ -230,7 +725,7 @@ class PalantirIntegrator:
         print(f"✨ [Success] File saved: {filename}")
 
 if __name__ == "__main__":
-    # TARGET_BOOK_ID example
-    TARGET_BOOK_ID = "S000217251615"
-    bot = PalantirIntegrator()
-    bot.execute_pipeline(TARGET_BOOK_ID, "Final_Integrated_Report.xlsx")
\ No newline at end of file
+    # `python main.py [book_id ...] [scrape options]` == `python cli.py scrape ...` (example ID when none given)
+    import sys
+    from cli import main as cli_main
+    sys.exit(cli_main(["scrape"] + sys.argv[1:]))
\ No newline at end of file
@@ -0,0 +1,147 @@
+import contextlib
+import cProfile
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, peak RSS is simply not reported
+    resource = None
+
+# Values the parsers substitute when a field is missing on the page / in the API object
+FIELD_DEFAULTS = {'Writer': 'Anonymous', 'Date': 'Unknown', 'Rating': '0', 'Likes': '0', 'Content': 'No Content'}
+PROFILE_DUMPS = ('cprofile', 'tracemalloc')
+
+
+def peak_rss_mb():
+    """Process-wide peak resident memory so far (MB), or None where getrusage is unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def count_fallbacks(rows):
+    """{field: how many rows hold the default value}. Note '0' likes/rating can also be a real value."""
+    counts = dict.fromkeys(FIELD_DEFAULTS, 0)
+    for row in rows:
+        for field, default in FIELD_DEFAULTS.items():
+            if str(row.get(field)) == default:
+                counts[field] += 1
+    return counts
+
+
+class PipelineProfiler:
+    """[Instrumentation] Spans per pipeline step, per-page navigate/wait/parse timings and memory peaks.
+
+    Recording is always on and costs a few perf_counter calls per page; cProfile / tracemalloc
+    only run when requested via start(dumps=...). report() is JSON-serialisable.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.spans = []
+        self.pages = []
+        self.counters = {}
+        self.fallbacks = dict.fromkeys(FIELD_DEFAULTS, 0)
+        self.meta = {}
+        self.dumps = ()
+        self._depth = 0
+        self._origin = time.perf_counter()
+        self._cprofile = None
+        self._snapshot = None
+
+    def start(self, dumps=(), **meta):
+        """Begin a fresh run. dumps: any of PROFILE_DUMPS."""
+        unknown = set(dumps) - set(PROFILE_DUMPS)
+        if unknown:
+            raise ValueError(f"Unknown profile dump(s) {sorted(unknown)} (choose from {PROFILE_DUMPS})")
+        self.reset()
+        self.meta = meta
+        self.dumps = tuple(dumps)
+        if 'tracemalloc' in self.dumps:
+            tracemalloc.start(25)
+        if 'cprofile' in self.dumps:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def stop(self):
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if 'tracemalloc' in self.dumps and tracemalloc.is_tracing():
+            self.meta['tracemalloc_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+            self._snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def span(self, name):
+        """Time a block; nested spans keep their depth so the report reads like a call tree."""
+        record = {'name': name, 'depth': self._depth, 'start': round(time.perf_counter() - self._origin, 4)}
+        self.spans.append(record)
+        self._depth += 1
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            self._depth -= 1
+            record['seconds'] = round(time.perf_counter() - started, 4)
+            record['peak_rss_mb'] = peak_rss_mb()
+
+    def page(self, page, rows, navigate=0.0, wait=0.0, parse=0.0, source="selenium"):
+        """One collected page: navigate = click / HTTP request, wait = render wait / delay, parse = extraction."""
+        fallbacks = count_fallbacks(rows)
+        for field, n in fallbacks.items():
+            self.fallbacks[field] += n
+        self.count('items_parsed', len(rows))
+        self.pages.append({'page': page, 'source': source, 'items': len(rows),
+                           'navigate': round(navigate, 4), 'wait': round(wait, 4), 'parse': round(parse, 4),
+                           'fallbacks': {k: v for k, v in fallbacks.items() if v}})
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def report(self, waits=()):
+        totals = {key: round(sum(p[key] for p in self.pages), 4) for key in ('navigate', 'wait', 'parse')}
+        return {
+            'meta': self.meta,
+            'spans': self.spans,
+            'pages': self.pages,
+            'page_totals': totals,
+            'counters': self.counters,
+            'fallbacks': self.fallbacks,
+            'waits': list(waits),
+            'peak_rss_mb': peak_rss_mb(),
+        }
+
+    def dump(self, path, waits=()):
+        """Write the JSON report to `path`; cProfile -> <path>.prof, tracemalloc -> <path>.tracemalloc.txt"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(waits), f, ensure_ascii=False, indent=2)
+        written = [path]
+
+        base = os.path.splitext(path)[0]
+        if self._cprofile is not None:
+            self._cprofile.dump_stats(base + ".prof")
+            written.append(base + ".prof")
+        if self._snapshot is not None:
+            with open(base + ".tracemalloc.txt", "w", encoding="utf-8") as f:
+                for stat in self._snapshot.statistics('lineno')[:50]:
+                    f.write(f"{stat}\n")
+            written.append(base + ".tracemalloc.txt")
+        print(f"   ⏱️ [Profile] Report written: {', '.join(written)}")
+        return written
+
+    def summary(self):
+        """One console line per top-level step."""
+        for record in self.spans:
+            if record['depth'] == 0 and 'seconds' in record:
+                print(f"   ⏱️ [Profile] {record['name']:<22} {record['seconds']:8.3f}s")
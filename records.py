@@ -0,0 +1,128 @@
+import datetime
+import sys
+from array import array
+
+REVIEW_FIELDS = ('Page', 'Writer', 'Date', 'Rating', 'Likes', 'Content')
+MISSING = -1  # stored for a rating / like count that is not a plain integer -> <NA> / null after conversion
+# Largest value each array buffer holds ('h' page, 'b' rating, 'i' likes)
+PAGE_MAX, RATING_MAX, LIKES_MAX = 2 ** 15 - 1, 2 ** 7 - 1, 2 ** 31 - 1
+
+
+def parse_count(value, limit=LIKES_MAX):
+    """'1,234' -> 1234, 10 -> 10; anything else ('Unknown', '4.5', '²', None, negative or above limit) -> MISSING.
+    isdecimal, not isdigit: '²'.isdigit() is True but int('²') raises."""
+    if type(value) is not int:
+        text = str(value).replace(",", "").strip() if value is not None else ""
+        if not text.isdecimal():
+            return MISSING
+        value = int(text)
+    return value if 0 <= value <= limit else MISSING
+
+
+def parse_page(value):
+    page = int(value)
+    if not 0 <= page <= PAGE_MAX:
+        raise ValueError(f"Page {page} does not fit the page buffer (0..{PAGE_MAX})")
+    return page
+
+
+class ReviewBatch:
+    """[Compact Records] Column-oriented review buffer instead of one dict per review.
+
+    Page / Rating / Likes are parsed once on append and kept in array('h' / 'b' / 'i') buffers;
+    Writer / Date / Content stay in plain lists (dates interned -- a book has few distinct days).
+    A row is parsed and range-checked completely before any buffer is touched, so a bad row raises
+    without leaving the columns different lengths. to_frame() / to_arrow() copy the numeric buffers once
+    (the batch can still be appended to afterwards).
+    Iterating yields the usual report dicts, so sinks, the store and the watermark code keep working.
+    """
+
+    __slots__ = ('page', 'writer', 'date', 'rating', 'likes', 'content')
+
+    def __init__(self, rows=()):
+        self.page = array('h')
+        self.writer = []
+        self.date = []
+        self.rating = array('b')
+        self.likes = array('i')
+        self.content = []
+        self.extend(rows)
+
+    def append(self, page, writer, date, rating, likes, content):
+        self.extend([{'Page': page, 'Writer': writer, 'Date': date, 'Rating': rating, 'Likes': likes,
+                      'Content': content}])
+
+    def extend(self, rows):
+        """Append report dicts (what the parsers and iter_review_pages yield), one column at a time.
+        Every row is parsed first: a row that raises (e.g. a missing key) leaves the batch unchanged."""
+        intern = sys.intern
+        parsed = [(parse_page(row['Page']), row['Writer'], intern(row['Date']), parse_count(row['Rating'], RATING_MAX),
+                   parse_count(row['Likes']), row['Content']) for row in rows]
+        if not parsed:
+            return self
+        pages, writers, dates, ratings, likes, contents = zip(*parsed)
+        self.page.extend(pages)
+        self.writer.extend(writers)
+        self.date.extend(dates)
+        self.rating.extend(ratings)
+        self.likes.extend(likes)
+        self.content.extend(contents)
+        return self
+
+    def __len__(self):
+        return len(self.page)
+
+    def __iter__(self):
+        return map(self.row, range(len(self.page)))
+
+    def row(self, i):
+        rating, likes = self.rating[i], self.likes[i]
+        return {'Page': self.page[i], 'Writer': self.writer[i], 'Date': self.date[i],
+                'Rating': None if rating == MISSING else rating, 'Likes': None if likes == MISSING else likes,
+                'Content': self.content[i]}
+
+    def _numeric(self, name):
+        import numpy as np
+        buf = getattr(self, name)
+        # A copy, not np.frombuffer: an exported buffer makes every later append raise BufferError
+        return np.array(buf, dtype=np.dtype(buf.typecode))
+
+    def to_frame(self):
+        """DataFrame (REVIEW_FIELDS order) with int16 Page and nullable Int8 Rating / Int32 Likes."""
+        import pandas as pd
+
+        def nullable(name):
+            values = self._numeric(name)
+            return pd.arrays.IntegerArray(values, values == MISSING)
+
+        return pd.DataFrame({
+            'Page': self._numeric('page'),
+            'Writer': self.writer,
+            'Date': self.date,
+            'Rating': nullable('rating'),
+            'Likes': nullable('likes'),
+            'Content': self.content,
+        }, columns=list(REVIEW_FIELDS), copy=False)
+
+    def to_arrow(self, book_id=None, crawl_date=None):
+        """Typed pa.Table in columnar.REVIEW_SCHEMA (MISSING -> null)."""
+        import columnar
+        columnar.require_arrow()
+        pa, pc = columnar.pa, columnar.pc
+
+        def numeric(name):
+            values = self._numeric(name)
+            return pa.array(values, mask=values == MISSING)
+
+        n = len(self)
+        return pa.table({
+            'book_id': pa.array([book_id] * n, pa.string()),
+            'page': numeric('page'),
+            'writer': pc.dictionary_encode(pa.array(self.writer, pa.string())).cast(
+                columnar.REVIEW_SCHEMA.field('writer').type),
+            'date': columnar._date_column(pa.array(self.date, pa.string())),
+            'rating': numeric('rating'),
+            'likes': numeric('likes'),
+            'content': pa.array(self.content, pa.string()),
+            'crawl_date': pa.array([crawl_date or datetime.date.today()] * n, pa.date32()),
+        }, schema=columnar.REVIEW_SCHEMA)
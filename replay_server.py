@@ -0,0 +1,261 @@
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+from html import escape
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Korean phrases used to build synthetic reviews (mix of highlight keywords and neutral text)
+SAMPLE_PHRASES = [
+    '번역이 매끄럽지 않아요', '직역투 문장이 많습니다', '가독성이 좋아요', '배송이 빨랐어요',
+    '내용이 알찹니다', '읽기 쉬운 책', '오역이 조금 보입니다', '추천합니다', '생각할 거리가 많아요'
+]
+
+
+def synthetic_reviews(count, seed=0):
+    """Generate `count` review objects shaped like the /api/review/list payload (newest first)."""
+    rng = random.Random(seed)
+    reviews = []
+    for i in range(count):
+        day = 28 - (i // 50) % 28
+        month = 12 - (i // 1400) % 12
+        reviews.append({
+            'mmbrId': f"user{i:06d}**",
+            'createdDate': f"2025-{month:02d}-{day:02d} 10:00:00",
+            'revwRating': rng.choice([10, 8, 6, 4, 2]),
+            'recmCnt': rng.randint(0, 30),
+            'revwCntn': f"{rng.choice(SAMPLE_PHRASES)} {rng.choice(SAMPLE_PHRASES)} #{i}"
+        })
+    return reviews
+
+
+def render_review_list(reviews):
+    """Render API review objects as the Kyobo .comment_list markup the Selenium path scrapes."""
+    items = []
+    for review in reviews:
+        items.append(
+            '<div class="comment_item">'
+            '<div class="comment_header"><div class="user_info_box">'
+            f'<span class="info_item">{escape(review["mmbrId"])}</span>'
+            f'<span class="info_item">{review["createdDate"][:10].replace("-", ".")}</span>'
+            '</div>'
+            f'<div class="rating-container"><input type="hidden" class="form-control rating-input" value="{review["revwRating"]}"></div>'
+            '</div>'
+            f'<div class="comment_contents"><div class="comment_text">{escape(review["revwCntn"] or "")}</div></div>'
+            f'<div class="comment_footer"><button class="btn_like"><span class="text">{review["recmCnt"]}</span></button></div>'
+            '</div>'
+        )
+    return '<div class="comment_list">' + "".join(items) + '</div>'
+
+
+# Minimal review widget: 'next' and 'Latest' swap .comment_list for a server-rendered fragment,
+# so the Selenium path (click -> stale first item -> re-parse) can run against the replay server.
+WIDGET_JS = """
+<script>
+(function () {
+    var book = "%(book_id)s", page = 1, last = %(last_page)d;
+    function load(p) {
+        fetch('/review/fragment?saleCmdtid=' + book + '&page=' + p).then(function (r) { return r.text(); })
+            .then(function (html) {
+                document.querySelector('.comment_list').outerHTML = html;
+                page = p;
+                document.querySelector('button.btn_page.next').classList.toggle('disabled', page >= last);
+            });
+    }
+    document.querySelector('button.btn_page.next').addEventListener('click', function () {
+        if (page < last) load(page + 1);
+    });
+    document.querySelector("input[value='001']").addEventListener('click', function () { load(1); });
+})();
+</script>
+"""
+
+
+def render_detail_page(review_list_html, filler_blocks=400, claimed=0, book_id="", last_page=1):
+    """Wrap a review list in a product-page-sized document (navigation, product info, recommendations...)."""
+    filler = "".join(
+        f'<div class="prod_area"><a href="/detail/S{i:012d}" class="prod_link"><img src="/img/{i}.jpg" alt="">'
+        f'<span class="prod_name">추천 도서 {i}</span><span class="price">{15000 + i * 10}원</span></a>'
+        f'<script>window.__data_{i} = {{"id": {i}, "tracking": "recommend"}};</script></div>'
+        for i in range(filler_blocks)
+    )
+    next_class = "btn_page next disabled" if last_page <= 1 else "btn_page next"
+    return ('<html><head><title>교보문고</title></head><body>'
+            f'<div id="contents">{filler}'
+            f'<div class="tab_list"><span class="tab_text">리뷰 ({claimed})</span><span class="count">{claimed}</span></div>'
+            '<section class="klover_review">'
+            '<div class="sort_list"><input type="radio" id="sort_001" name="sort" value="001">'
+            '<label for="sort_001">최신순</label></div>'
+            f'{review_list_html}'
+            f'<div class="pagination"><button class="{next_class}">다음</button></div></section>'
+            '</div>'
+            + WIDGET_JS % {'book_id': escape(book_id), 'last_page': last_page}
+            + '</body></html>')
+
+
+def load_recording(path):
+    """Load a recording file: {"<book_id>": [<api review object>, ...], ...}"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class ReplayServer:
+    """[Stand-in] Local HTTP server that replays recorded Kyobo review-list JSON
+    (plus a paginated detail page for the Selenium path).
+
+    Usage:
+        with ReplayServer({"S000000000001": synthetic_reviews(5000)}) as server:
+            api = KyoboReviewAPI(base_url=server.url)
+    """
+
+    def __init__(self, books, host="127.0.0.1", port=0, require_cookie=False, latency=0.0, page_size=10,
+                 etag=False):
+        self.books = books
+        # Reviews per rendered HTML page (the site shows 10); the JSON API honours pageLimit instead
+        self.page_size = page_size
+        # Injected server latency in seconds: a number, or a (min, max) range drawn per request
+        self.latency = latency
+        # WAF simulation: API calls without the cookie handed out by /detail/<id> get an HTML block page
+        self.require_cookie = require_cookie
+        # Conditional requests: API responses carry an ETag and If-None-Match gets a bodiless 304
+        self.etag = etag
+        self.not_modified_count = 0
+        self.waf_token = uuid.uuid4().hex
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server._lock:
+                    server.request_count += 1
+                server.delay()
+                parsed = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+
+                if parsed.path == "/api/review/list":
+                    cookie = SimpleCookie(self.headers.get("Cookie", ""))
+                    token = cookie["WAF_TOKEN"].value if "WAF_TOKEN" in cookie else None
+                    if server.require_cookie and token != server.waf_token:
+                        self._send(200, "text/html", "<html><body>Access Denied (WAF)</body></html>")
+                        return
+                    self._send(200, "application/json", json.dumps(server.review_page(query), ensure_ascii=False),
+                               etag=server.etag)
+                elif parsed.path.startswith("/detail/"):
+                    book_id = parsed.path.rsplit("/", 1)[-1]
+                    self._send(200, "text/html", server.detail_page(book_id),
+                               cookie=f"WAF_TOKEN={server.waf_token}; Path=/")
+                elif parsed.path == "/review/fragment":
+                    self._send(200, "text/html", server.review_fragment(query.get('saleCmdtid'),
+                                                                        int(query.get('page', 1))))
+                else:
+                    self._send(404, "text/html", "<html><body>Not Found</body></html>")
+
+            def _send(self, status, content_type, body, cookie=None, etag=False):
+                raw = body.encode("utf-8")
+                tag = f'"{hashlib.sha1(raw).hexdigest()[:16]}"' if etag else None
+                if tag and self.headers.get("If-None-Match") == tag:
+                    with server._lock:
+                        server.not_modified_count += 1
+                    self.send_response(304)
+                    self.send_header("ETag", tag)
+                    self.end_headers()
+                    return
+                self.send_response(status)
+                if tag:
+                    self.send_header("ETag", tag)
+                if cookie:
+                    self.send_header("Set-Cookie", cookie)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def review_page(self, query):
+        reviews = self.books.get(query.get('saleCmdtid'), [])
+        page = int(query.get('page', 1))
+        limit = int(query.get('pageLimit', 10))
+        start = (page - 1) * limit
+        return {
+            'data': {
+                'totalCount': len(reviews),
+                'reviewList': reviews[start:start + limit]
+            },
+            'resultCode': '000'
+        }
+
+    def review_fragment(self, book_id, page):
+        reviews = self.books.get(book_id, [])
+        start = (page - 1) * self.page_size
+        return render_review_list(reviews[start:start + self.page_size])
+
+    def detail_page(self, book_id):
+        reviews = self.books.get(book_id, [])
+        last_page = max(1, -(-len(reviews) // self.page_size))
+        return render_detail_page(self.review_fragment(book_id, 1), claimed=len(reviews),
+                                  book_id=book_id, last_page=last_page)
+
+    def delay(self):
+        if isinstance(self.latency, (tuple, list)):
+            time.sleep(random.uniform(*self.latency))
+        elif self.latency:
+            time.sleep(self.latency)
+
+    def rotate_token(self):
+        """Invalidate every issued cookie (simulates a WAF session expiring mid-run)."""
+        self.waf_token = uuid.uuid4().hex
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay recorded Kyobo review-list JSON on localhost.")
+    parser.add_argument("--recording", help="JSON file of {book_id: [reviews]}")
+    parser.add_argument("--synthetic", type=int, default=5000, help="Synthetic review count (no recording)")
+    parser.add_argument("--book-id", default="S000217251615")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Injected latency per request (seconds)")
+    parser.add_argument("--page-size", type=int, default=10, help="Reviews per rendered HTML page")
+    args = parser.parse_args()
+
+    books = load_recording(args.recording) if args.recording else {args.book_id: synthetic_reviews(args.synthetic)}
+    server = ReplayServer(books, port=args.port, latency=args.latency, page_size=args.page_size)
+    print(f"--- [Replay] Serving {sum(len(v) for v in books.values())} reviews at {server.url} ---")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,63 @@
+import time
+
+from openpyxl import Workbook
+from openpyxl.formatting.rule import FormulaRule
+from openpyxl.styles import PatternFill
+from openpyxl.utils import get_column_letter
+
+# Keywords for highlighting (Targeting Korean review text)
+HIGHLIGHT_KEYWORDS = ['번역', '직역', '문장', '오역', '가독성', '읽기']
+YELLOW_FILL = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
+
+
+def keyword_formula(keywords, cell):
+    """Excel formula that is TRUE when `cell` contains any keyword (what highlight_excel checked in Python)."""
+    tests = ",".join('ISNUMBER(SEARCH("{}",{}))'.format(k.replace('"', '""'), cell) for k in keywords)
+    return f"OR({tests})"
+
+
+def _iter_records(data, columns):
+    """Accept a DataFrame or any iterable of dicts and yield plain value lists in `columns` order."""
+    if hasattr(data, "itertuples"):
+        from pandas import NA  # nullable Int columns (records.ReviewBatch) -> empty cells
+        positions = [list(data.columns).index(c) for c in columns]
+        for row in data.itertuples(index=False, name=None):
+            yield [None if row[i] is NA else row[i] for i in positions]
+    else:
+        for row in data:
+            yield [row.get(c) for c in columns]
+
+
+def write_report(data, filename, columns=None, keywords=HIGHLIGHT_KEYWORDS, highlight_column='Content',
+                 sheet_title="Sheet1"):
+    """[Report Writer] Write the review sheet in one streaming pass (openpyxl write-only mode).
+
+    Highlighting is a single conditional-formatting rule over the whole table instead of one
+    PatternFill per cell, so the workbook is never re-opened and memory does not grow with cell count.
+    `data` may be a DataFrame or a generator of row dicts (e.g. ReviewStore.iter_rows()).
+    Returns the number of data rows written.
+    """
+    started = time.perf_counter()
+    if columns is None:
+        columns = list(data.columns) if hasattr(data, "columns") else ['Page', 'Writer', 'Date', 'Rating',
+                                                                       'Likes', 'Content']
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_title)
+    ws.append(columns)
+
+    rows = 0
+    for values in _iter_records(data, columns):
+        ws.append(values)
+        rows += 1
+
+    if keywords and rows and highlight_column in columns:
+        content_col = get_column_letter(columns.index(highlight_column) + 1)
+        last_col = get_column_letter(len(columns))
+        ws.conditional_formatting.add(
+            f"A2:{last_col}{rows + 1}",
+            FormulaRule(formula=[keyword_formula(keywords, f"${content_col}2")], fill=YELLOW_FILL)
+        )
+
+    wb.save(filename)
+    print(f"✨ [Success] File saved: {filename} ({rows} rows in {time.perf_counter() - started:.2f}s)")
+    return rows
@@ -0,0 +1,169 @@
+import os
+import sqlite3
+import time
+
+from fingerprints import review_key
+from records import LIKES_MAX, MISSING, RATING_MAX, parse_count
+from report_writer import write_report
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    book_id     TEXT NOT NULL,
+    review_hash TEXT NOT NULL,   -- fingerprints.review_key (16 hex digits)
+    page        INTEGER,
+    writer      TEXT,
+    date        TEXT,
+    rating      INTEGER,         -- NULL when the page had no usable number (records.parse_count)
+    likes       INTEGER,
+    content     TEXT,
+    first_seen  TEXT,
+    last_seen   TEXT,
+    PRIMARY KEY (book_id, review_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_book_date ON reviews (book_id, date);
+CREATE INDEX IF NOT EXISTS idx_reviews_book_rating ON reviews (book_id, rating);
+CREATE INDEX IF NOT EXISTS idx_reviews_date ON reviews (date);
+"""
+
+# Columns as they appear in every report (same order as the scrapers produce)
+EXPORT_COLUMNS = {'page': 'Page', 'writer': 'Writer', 'date': 'Date', 'rating': 'Rating',
+                  'likes': 'Likes', 'content': 'Content'}
+
+
+def _count(value, limit=LIKES_MAX):
+    """Same parsing as ReviewBatch ('1,234' -> 1234), but missing -> NULL instead of the MISSING sentinel."""
+    value = parse_count(value, limit)
+    return None if value == MISSING else value
+
+
+class ReviewStore:
+    """[Review Store] Persistent SQLite (WAL) store keyed by (book_id, review_hash).
+
+    Pages are upserted as soon as they are parsed, so re-runs are idempotent and
+    every export (Excel / CSV / JSONL) is generated from here rather than from memory.
+    """
+
+    def __init__(self, path="reviews.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def upsert(self, book_id, rows):
+        """Insert new reviews, refresh mutable fields (likes, rating, page) of known ones. Returns #new rows."""
+        if not rows:
+            return 0
+        now = time.strftime("%Y-%m-%d %H:%M:%S")
+        params = [(book_id, review_key(r['Writer'], r['Date'], r['Content']), r['Page'], r['Writer'], r['Date'],
+                   _count(r['Rating'], RATING_MAX), _count(r['Likes']), r['Content'], now, now) for r in rows]
+        with self.conn:
+            # total_changes instead of COUNT(*) before/after: streaming callers upsert every page
+            before = self.conn.total_changes
+            self.conn.executemany(
+                """INSERT INTO reviews (book_id, review_hash, page, writer, date, rating, likes, content,
+                                        first_seen, last_seen)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (book_id, review_hash) DO NOTHING""", params)
+            inserted = self.conn.total_changes - before
+            self.conn.executemany(
+                """UPDATE reviews SET page = ?, rating = ?, likes = ?, last_seen = ?
+                   WHERE book_id = ? AND review_hash = ?""",
+                [(p[2], p[5], p[6], now, book_id, p[1]) for p in params])
+        return inserted
+
+    def count(self, book_id=None):
+        if book_id is None:
+            return self.conn.execute("SELECT COUNT(*) FROM reviews").fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM reviews WHERE book_id = ?", (book_id,)).fetchone()[0]
+
+    def book_ids(self):
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT book_id FROM reviews ORDER BY book_id")]
+
+    def load(self, book_id=None, since=None):
+        """Reviews as a report DataFrame, newest first. book_id=None -> every book (adds a 'Book ID' column)."""
+        import pandas as pd  # lazily: xlsx exports stream through iter_rows and never need it
+        where, args = [], []
+        if book_id is not None:
+            where.append("book_id = ?")
+            args.append(book_id)
+        if since is not None:
+            where.append("date >= ?")
+            args.append(since)
+        sql = "SELECT book_id, " + ", ".join(EXPORT_COLUMNS) + " FROM reviews"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY book_id, date DESC, page, rowid"
+
+        df = pd.read_sql_query(sql, self.conn, params=args).rename(columns=EXPORT_COLUMNS)
+        # NULL would turn the integer columns into floats: same nullable dtypes as ReviewBatch.to_frame
+        df = df.astype({'Rating': "Int8", 'Likes': "Int32"})
+        if book_id is not None:
+            return df.drop(columns=['book_id'])
+        return df.rename(columns={'book_id': 'Book ID'})
+
+    def iter_rows(self, book_id=None, batch_size=5000):
+        """Stream stored reviews as report dicts (same order as load) without building a DataFrame."""
+        sql = "SELECT book_id, " + ", ".join(EXPORT_COLUMNS) + " FROM reviews"
+        args = ()
+        if book_id is not None:
+            sql += " WHERE book_id = ?"
+            args = (book_id,)
+        sql += " ORDER BY book_id, date DESC, page, rowid"
+
+        cursor = self.conn.execute(sql, args)
+        names = ['Book ID'] + list(EXPORT_COLUMNS.values())
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            for values in batch:
+                yield dict(zip(names, values))
+
+    def to_arrow(self, book_id=None):
+        """Stored reviews as a typed pa.Table (crawl_date = day the review was first seen), no DataFrame."""
+        import columnar  # pyarrow is optional and only loaded for columnar exports
+        sql = ("SELECT book_id, page, writer, date, rating, likes, content, substr(first_seen, 1, 10) "
+               "FROM reviews")
+        args = ()
+        if book_id is not None:
+            sql += " WHERE book_id = ?"
+            args = (book_id,)
+        sql += " ORDER BY book_id, date DESC, page, rowid"
+        names = ['Book ID'] + list(EXPORT_COLUMNS.values()) + ['Crawl Date']
+        rows = self.conn.execute(sql, args).fetchall()
+        columns = dict(zip(names, map(list, zip(*rows)))) if rows else {name: [] for name in names}
+        return columnar.columns_to_arrow(columns)
+
+    def export_dataset(self, root, book_id=None):
+        """Merge the stored reviews into a Parquet dataset partitioned by book_id / crawl_date (= first_seen)."""
+        import columnar
+        return columnar.write_dataset(self.to_arrow(book_id), root)
+
+    def export(self, filename, book_id=None):
+        """Write the stored reviews as .xlsx / .csv / .jsonl / .parquet (by file extension). Returns #rows."""
+        ext = os.path.splitext(filename)[1].lower()
+        if ext == ".parquet":
+            import columnar
+            return columnar.write_parquet(self.to_arrow(book_id), filename)
+        if ext in (".xlsx", ".xlsm"):
+            columns = list(EXPORT_COLUMNS.values()) if book_id is not None else ['Book ID'] + list(EXPORT_COLUMNS.values())
+            return write_report(self.iter_rows(book_id), filename, columns=columns)
+
+        df = self.load(book_id)
+        if ext == ".csv":
+            df.to_csv(filename, index=False, encoding="utf-8-sig")  # BOM so Excel opens Korean text correctly
+        elif ext == ".jsonl":
+            df.to_json(filename, orient="records", lines=True, force_ascii=False)
+        else:
+            raise ValueError(f"Unsupported export format '{ext}' (use .xlsx, .csv, .jsonl or .parquet)")
+        return len(df)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
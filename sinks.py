@@ -0,0 +1,137 @@
+import csv
+import json
+import os
+
+from review_store import ReviewStore
+
+SINK_COLUMNS = ['Book ID', 'Page', 'Writer', 'Date', 'Rating', 'Likes', 'Content']
+
+
+class ReviewSink:
+    """[Sink] Consumes review pages one at a time: write(book_id, rows) -> flush() -> close().
+
+    One sink can be shared by several books (each row carries its Book ID).
+    """
+
+    def write(self, book_id, rows):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvSink(ReviewSink):
+    """Append rows to a CSV file, flushing after every page."""
+
+    def __init__(self, path):
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        # BOM only at the start of a new file so Excel opens the Korean text correctly
+        self.file = open(path, "a", newline="", encoding="utf-8-sig" if is_new else "utf-8")
+        self.writer = csv.DictWriter(self.file, fieldnames=SINK_COLUMNS)
+        if is_new:
+            self.writer.writeheader()
+        self.count = 0
+
+    def write(self, book_id, rows):
+        self.writer.writerows({'Book ID': book_id, **row} for row in rows)
+        self.count += len(rows)
+        self.flush()
+
+    def flush(self):
+        if not self.file.closed:
+            self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+class JsonlSink(ReviewSink):
+    """One JSON object per line; a partially written run is still valid up to the last page."""
+
+    def __init__(self, path):
+        self.file = open(path, "a", encoding="utf-8")
+        self.count = 0
+
+    def write(self, book_id, rows):
+        for row in rows:
+            self.file.write(json.dumps({'Book ID': book_id, **row}, ensure_ascii=False) + "\n")
+        self.count += len(rows)
+        self.flush()
+
+    def flush(self):
+        if not self.file.closed:
+            self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+class StoreSink(ReviewSink):
+    """Upsert each page into the SQLite ReviewStore (accepts an open store or a database path)."""
+
+    def __init__(self, store="reviews.db"):
+        self.owns_store = not isinstance(store, ReviewStore)
+        self.store = ReviewStore(store) if self.owns_store else store
+        self.count = 0
+
+    def write(self, book_id, rows):
+        self.count += self.store.upsert(book_id, rows)
+
+    def close(self):
+        if self.owns_store:
+            self.store.close()
+
+
+class ParquetSink(ReviewSink):
+    """Typed Parquet file (columnar.REVIEW_SCHEMA), written as one row group per `row_group_size` rows."""
+
+    def __init__(self, path, row_group_size=50000):
+        import columnar
+        columnar.require_arrow()
+        self.columnar = columnar
+        self.writer = columnar.pq.ParquetWriter(path, columnar.REVIEW_SCHEMA, compression="zstd")
+        self.row_group_size = row_group_size
+        self.pending = []
+        self.count = 0
+
+    def write(self, book_id, rows):
+        self.pending.extend({'Book ID': book_id, **row} for row in rows)
+        self.count += len(rows)
+        if len(self.pending) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        if self.pending and self.writer is not None:
+            self.writer.write_table(self.columnar.to_arrow(self.pending))
+            self.pending = []
+
+    def close(self):
+        if self.writer is not None:
+            self.flush()
+            self.writer.close()
+            self.writer = None
+
+
+def open_sink(path):
+    """Pick a sink from the file extension: .csv, .jsonl, .parquet or .db/.sqlite."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return CsvSink(path)
+    if ext == ".jsonl":
+        return JsonlSink(path)
+    if ext == ".parquet":
+        return ParquetSink(path)
+    if ext in (".db", ".sqlite", ".sqlite3"):
+        return StoreSink(path)
+    raise ValueError(f"No sink for '{path}' (use .csv, .jsonl, .parquet or .db)")
@@ -0,0 +1,55 @@
+"""[Test] The api engine against replay_server.ReplayServer (no network, no Chrome).
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+
+from kyobo_api import KyoboReviewAPI
+from main import PalantirIntegrator
+from replay_server import ReplayServer, synthetic_reviews
+
+BOOK_ID = "S000000000001"
+
+
+def test_scrape_reviews_collects_every_page():
+    reviews = synthetic_reviews(250)
+    with ReplayServer({BOOK_ID: reviews}) as server:
+        api = KyoboReviewAPI(base_url=server.url, page_limit=100)
+        df = api.scrape_reviews(BOOK_ID, max_pages=10)
+        requests = server.request_count
+
+    assert len(df) == 250
+    assert api.total_count == 250
+    assert api.stopped == 'end'
+    assert requests == 3  # 100 + 100 + 50 -- the short page ends the run without an extra request
+    assert df['Content'].tolist() == [r['revwCntn'] for r in reviews]
+    assert df['Writer'].iloc[0] == reviews[0]['mmbrId']
+
+
+def test_pipeline_api_engine_writes_report_and_delta_stops_at_watermark(tmp_path):
+    reviews = synthetic_reviews(250)
+    output = str(tmp_path / "report.xlsx")
+    with ReplayServer({BOOK_ID: reviews}) as server:
+        app = PalantirIntegrator(api_base_url=server.url, watermark_path=str(tmp_path / "watermarks.json"))
+        first = app.execute_pipeline(BOOK_ID, output_file=output, engine="api", delta=True)
+        assert first['status'] == 'ok'
+        assert first['collected'] == 250
+        assert first['claimed'] == 250
+        assert len(pd.read_excel(output)) == 250
+
+        newer = synthetic_reviews(3, seed=1)
+        for i, review in enumerate(newer):
+            review['mmbrId'] = f"new{i:03d}**"
+            review['createdDate'] = "2026-01-01 10:00:00"
+        server.books[BOOK_ID] = newer + reviews
+        second = app.execute_pipeline(BOOK_ID, output_file=output, engine="api", delta=True)
+
+    assert second['status'] == 'ok'
+    assert second['collected'] == 3
+    assert second['claimed'] == 253